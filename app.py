@@ -1,18 +1,25 @@
 # app.py
 """TrialMetrics - Clinical Trial Analytics Dashboard."""
 
+import zlib
+import numpy as np
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from streamlit.runtime.scriptrunner import (
+    add_script_run_ctx,
+    get_script_run_ctx
+)
 
 from src.api.clinical_trials import (
+    DETAIL_FIELDS,
     search_trials,
     get_trial_details,
     parse_trial_summary
 )
 from src.analysis.power_analysis import (
     analyze_trial_power,
+    calculate_power_two_sample,
     generate_power_curve
 )
 from src.analysis.enrollment_forecast import (
@@ -23,9 +30,14 @@ from src.analysis.enrollment_forecast import (
 from src.analysis.cost_model import (
     calculate_budget,
     get_budget_summary,
-    format_currency
+    format_currency,
+    round_for_display
+)
+from src.ai.summarizer import (
+    get_trial_summary,
+    is_ai_available,
+    stream_trial_summary
 )
-from src.ai.summarizer import get_trial_summary
 
 # Page configuration
 st.set_page_config(
@@ -36,7 +48,7 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Main header styling */
     .main-header {
@@ -52,9 +64,14 @@ st.markdown("""
     }
 
     /* Metric card styling */
-    [data-testid="stMetricValue"] {
+    .metric-label {
+        font-size: 0.875rem;
+        margin-bottom: 0.25rem;
+    }
+    .metric-value {
         font-size: 1.8rem;
         font-weight: 600;
+        line-height: 1.4;
     }
 
     /* Status badges */
@@ -93,11 +110,220 @@ st.markdown("""
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_search(condition: str, status: str, page_size: int) -> list:
+    """Search ClinicalTrials.gov and parse results, memoized per query.
+
+    Streamlit reruns the whole script on every widget interaction, so
+    the search is cached on its inputs to avoid repeating the HTTP
+    round-trip and JSON parsing.
+
+    Args:
+        condition: Medical condition to search for.
+        status: Trial status filter.
+        page_size: Number of results to return.
+
+    Returns:
+        list: Parsed trial summaries from parse_trial_summary().
+    """
+    results = search_trials(
+        condition=condition,
+        status=status,
+        page_size=page_size
+    )
+    return [parse_trial_summary(t) for t in results.get("studies", [])]
+
+
+# Summary fields left out of the search projection (SEARCH_FIELDS) and
+# backfilled from the trial's detail record
+BACKFILL_FIELDS = ("sites_count", "conditions", "interventions")
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_trial_details(nct_id: str) -> dict:
+    """Fetch and parse the full record for a single trial, memoized per ID.
+
+    Args:
+        nct_id: The NCT identifier (e.g., "NCT12345678").
+
+    Returns:
+        dict: Parsed trial summary from parse_trial_summary().
+    """
+    return parse_trial_summary(
+        get_trial_details(nct_id, fields=DETAIL_FIELDS)
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _cached_power_curve(
+    max_n: int,
+    effect_size: float,
+    alpha: float,
+    step: int
+) -> tuple:
+    """Generate power curve data, memoized on its inputs.
+
+    Args:
+        max_n: Maximum sample size per group to calculate.
+        effect_size: Cohen's d effect size.
+        alpha: Significance level.
+        step: Increment between sample size points.
+
+    Returns:
+        tuple: (sample_sizes, powers) from generate_power_curve().
+    """
+    return generate_power_curve(
+        max_n=max_n,
+        effect_size=effect_size,
+        alpha=alpha,
+        step=step
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _cached_forecast(
+    seed: int,
+    start_date_str: str,
+    target: int,
+    days_elapsed: int,
+    final_enrollment: int,
+    forecast_days: int = 365
+):
+    """Simulate enrollment history and build the forecast series.
+
+    The synthetic history is fully determined by the seed, so the result
+    depends only on the arguments and is memoized on them.
+
+    Args:
+        seed: Random seed for the simulated enrollment history.
+        start_date_str: Trial start date (YYYY-MM-DD format).
+        target: Target enrollment.
+        days_elapsed: Number of days since trial start.
+        final_enrollment: Enrollment at day `days_elapsed`.
+        forecast_days: Number of days to forecast ahead.
+
+    Returns:
+        pd.DataFrame: Series from generate_forecast_series().
+    """
+    history = generate_synthetic_enrollment(
+        start_date=start_date_str,
+        target=target,
+        days_elapsed=days_elapsed,
+        seed=seed,
+        final_enrollment=final_enrollment
+    )
+    return generate_forecast_series(
+        enrollment_history=history,
+        target_enrollment=target,
+        forecast_days=forecast_days
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _estimate_enrollment_actual(
+    start_date: str,
+    enrollment_target: int,
+    enrollment_type: str,
+    today: date
+) -> tuple:
+    """Estimate current enrollment from trial progress, memoized on inputs.
+
+    Uses the registry count when enrollment is ACTUAL; otherwise
+    estimates enrollment from time since start (recruiting trials are
+    typically ~60% enrolled).
+
+    Args:
+        start_date: Trial start date (YYYY-MM or YYYY-MM-DD format).
+        enrollment_target: Target enrollment count.
+        enrollment_type: ACTUAL or ESTIMATED.
+        today: Current date.
+
+    Returns:
+        tuple: (enrollment_actual, start_dt, days_elapsed), where
+            start_dt and days_elapsed are None if the start date is
+            missing or invalid.
+    """
+    start_dt = None
+    days_elapsed = None
+    if start_date:
+        try:
+            if len(start_date) == 7:  # YYYY-MM format
+                start_date = f"{start_date}-01"
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            days_elapsed = (today - start_dt.date()).days
+        except ValueError:
+            pass
+
+    if enrollment_type == 'ACTUAL':
+        # This IS the real current enrollment
+        enrollment_actual = enrollment_target
+    elif days_elapsed is not None:
+        progress_ratio = min(0.85, max(0.3, days_elapsed / 1095))
+        enrollment_actual = int(enrollment_target * progress_ratio)
+    else:
+        enrollment_actual = int(enrollment_target * 0.6)
+
+    return enrollment_actual, start_dt, days_elapsed
+
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_summary(
+    nct_id: str,
+    power_pct: float,
+    spent_bucket: float,
+    _trial: dict,
+    _power_result: dict,
+    _budget_result,
+    _forecast_result: dict = None
+) -> tuple:
+    """Generate the template-based trial summary, memoized on scalars.
+
+    Only the leading scalar arguments form the cache key; the
+    underscore-prefixed inputs are excluded from hashing by Streamlit
+    and are used solely to build the summary on a cache miss.
+
+    Args:
+        nct_id: Trial identifier.
+        power_pct: Power at actual enrollment, rounded.
+        spent_bucket: Budget spent to date, rounded.
+        _trial: Trial data dictionary.
+        _power_result: Power analysis results.
+        _budget_result: Budget analysis results.
+        _forecast_result: Optional enrollment forecast.
+
+    Returns:
+        tuple: (summary_text, source) from get_trial_summary().
+    """
+    return get_trial_summary(
+        trial_data=_trial,
+        power_result=_power_result,
+        budget_result=_budget_result,
+        forecast_result=_forecast_result,
+        use_ai=False
+    )
+
+
+def inject_css():
+    """Inject the custom CSS.
+
+    Streamlit drops any element not re-emitted during a rerun, so this
+    runs on every script execution rather than once per session.
+    """
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+def render_header(now: datetime = None):
+    """Render the dashboard header.
+
+    Args:
+        now: Timestamp shown as the last update (defaults to now).
+    """
+    if now is None:
+        now = datetime.now()
 
-def render_header():
-    """Render the dashboard header."""
     col1, col2 = st.columns([3, 1])
     with col1:
         st.markdown(
@@ -112,7 +338,7 @@ def render_header():
     with col2:
         st.markdown(
             f"<p style='text-align: right; color: #888;'>"
-            f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>",
+            f"Last updated: {now.strftime('%Y-%m-%d %H:%M')}</p>",
             unsafe_allow_html=True
         )
 
@@ -158,18 +384,19 @@ def render_sidebar():
         if search_clicked or "trials" not in st.session_state:
             with st.spinner("Searching ClinicalTrials.gov..."):
                 try:
-                    results = search_trials(
-                        condition=condition,
-                        status=status,
-                        page_size=20
+                    st.session_state.trials = _cached_search(
+                        condition, status, 20
                     )
-                    trials = results.get("studies", [])
-                    st.session_state.trials = [
-                        parse_trial_summary(t) for t in trials
-                    ]
                 except Exception as e:
                     st.error(f"API Error: {str(e)}")
                     st.session_state.trials = []
+                st.session_state.trials_by_id = {
+                    t['nct_id']: t for t in st.session_state.trials
+                }
+                st.session_state.trial_options = {
+                    f"{t['nct_id']} - {t['title'][:40]}...": t['nct_id']
+                    for t in st.session_state.trials
+                }
 
         # Trial selector
         st.markdown("---")
@@ -179,10 +406,7 @@ def render_sidebar():
         )
 
         if st.session_state.get("trials"):
-            trial_options = {
-                f"{t['nct_id']} - {t['title'][:40]}...": t['nct_id']
-                for t in st.session_state.trials
-            }
+            trial_options = st.session_state.trial_options
             selected_label = st.selectbox(
                 "Trial",
                 options=list(trial_options.keys()),
@@ -248,13 +472,35 @@ def render_sidebar():
         }
 
 
+def metric_card_html(label: str, value: str, note: str) -> str:
+    """Build the HTML for a metric card and its annotation.
+
+    Args:
+        label: Metric label.
+        value: Formatted metric value.
+        note: Annotation HTML shown below the value.
+
+    Returns:
+        str: HTML for a single st.markdown call.
+    """
+    return (
+        f'<div class="metric-label">{label}</div>'
+        f'<div class="metric-value">{value}</div>'
+        f'{note}'
+    )
+
+
 def render_metrics(
     trial: dict,
     power_result: dict,
     budget_result,
     enrollment_actual: int
 ):
-    """Render the key metrics row with clean annotations and tooltips."""
+    """Render the key metrics row with clean annotations and tooltips.
+
+    Each card is emitted as a single markdown block rather than a
+    metric plus a separate annotation element.
+    """
     col1, col2, col3, col4 = st.columns(4)
 
     enrollment_target = trial.get('enrollment_target', 0)
@@ -262,96 +508,97 @@ def render_metrics(
 
     with col1:
         if enrollment_type == 'ACTUAL':
-            st.metric(label="Enrollment (Actual)", value=f"{enrollment_target}")
-            st.markdown(
+            card = metric_card_html(
+                "Enrollment (Actual)",
+                f"{enrollment_target}",
                 '<span title="This is verified enrollment data from the '
                 'trial registry." style="cursor: help;">'
-                '✓ Real data</span>',
-                unsafe_allow_html=True
+                '✓ Real data</span>'
             )
         else:
-            progress = enrollment_actual / enrollment_target if enrollment_target else 0
-            st.metric(
-                label="Enrollment",
-                value=f"{enrollment_actual}/{enrollment_target}"
-            )
-            st.markdown(
+            card = metric_card_html(
+                "Enrollment",
+                f"{enrollment_actual}/{enrollment_target}",
                 '<span title="Current enrollment is estimated based on '
                 'trial start date and typical recruitment rates. '
                 'ClinicalTrials.gov does not provide real-time enrollment '
                 'counts for recruiting trials." '
                 'style="color: #888; font-size: 0.85em; cursor: help;">'
-                'ⓘ Estimated</span>',
-                unsafe_allow_html=True
+                'ⓘ Estimated</span>'
             )
+        st.markdown(card, unsafe_allow_html=True)
 
     with col2:
         power_pct = power_result['power_at_actual'] * 100
         is_underpowered = power_result['is_underpowered']
-        st.metric(label="Statistical Power", value=f"{power_pct:.0f}%")
         if is_underpowered:
-            st.markdown(
+            note = (
                 '<span title="Power below 80% means the study may not '
                 'detect a true treatment effect. Scale: &lt;80% = '
                 'Underpowered (red), ≥80% = Adequate (green)." '
                 'style="color: #EF4444; cursor: help;">'
-                '⚠️ Underpowered</span>',
-                unsafe_allow_html=True
+                '⚠️ Underpowered</span>'
             )
         else:
-            st.markdown(
+            note = (
                 '<span title="Power ≥80% is the standard threshold for '
                 'clinical trials. Scale: &lt;80% = Underpowered (red), '
                 '≥80% = Adequate (green)." '
                 'style="color: #10B981; cursor: help;">'
-                '✓ Adequate</span>',
-                unsafe_allow_html=True
+                '✓ Adequate</span>'
             )
+        st.markdown(
+            metric_card_html("Statistical Power", f"{power_pct:.0f}%", note),
+            unsafe_allow_html=True
+        )
 
     with col3:
-        st.metric(
-            label="Budget Spent",
-            value=format_currency(budget_result.spent_to_date)
-        )
         total = format_currency(budget_result.total_budget)
         pct_spent = (budget_result.spent_to_date /
                      budget_result.total_budget * 100)
         st.markdown(
-            f'<span title="Total estimated budget based on phase, '
-            f'enrollment target, and site count using industry benchmarks. '
-            f'Currently {pct_spent:.0f}% utilized." '
-            f'style="color: #888; font-size: 0.85em; cursor: help;">'
-            f'of {total}</span>',
+            metric_card_html(
+                "Budget Spent",
+                format_currency(budget_result.spent_to_date),
+                f'<span title="Total estimated budget based on phase, '
+                f'enrollment target, and site count using industry '
+                f'benchmarks. Currently {pct_spent:.0f}% utilized." '
+                f'style="color: #888; font-size: 0.85em; cursor: help;">'
+                f'of {total}</span>'
+            ),
             unsafe_allow_html=True
         )
 
     with col4:
-        runway_display = (
-            f"{budget_result.runway_months:.1f}"
-            if budget_result.runway_months else "N/A"
+        runway = round_for_display(
+            "runway_months", budget_result.runway_months
+        )
+        runway_display = f"{runway:.1f}" if runway else "N/A"
+        efficiency = round_for_display(
+            "efficiency_ratio", budget_result.efficiency_ratio
         )
-        st.metric(label="Runway (months)", value=runway_display)
-        efficiency = budget_result.efficiency_ratio
         if efficiency >= 1.0:
-            st.markdown(
+            note = (
                 f'<span title="Efficiency = (Enrollment Progress) / '
                 f'(Budget Spent %). Values ≥1.0 mean enrollment is '
                 f'on pace with spending. Scale: &lt;1.0 = Over budget '
                 f'(red), ≥1.0 = On/under budget (green)." '
                 f'style="color: #10B981; cursor: help;">'
-                f'Efficiency: {efficiency:.2f}x</span>',
-                unsafe_allow_html=True
+                f'Efficiency: {efficiency:.2f}x</span>'
             )
         else:
-            st.markdown(
+            note = (
                 f'<span title="Efficiency = (Enrollment Progress) / '
                 f'(Budget Spent %). Values &lt;1.0 mean spending '
                 f'outpaces enrollment. Scale: &lt;1.0 = Over budget '
                 f'(red), ≥1.0 = On/under budget (green)." '
                 f'style="color: #EF4444; cursor: help;">'
-                f'Efficiency: {efficiency:.2f}x</span>',
-                unsafe_allow_html=True
+                f'Efficiency: {efficiency:.2f}x</span>'
             )
+        st.markdown(
+            metric_card_html("Runway (months)", runway_display, note),
+            unsafe_allow_html=True
+        )
 
 
 def render_power_chart(
@@ -368,7 +615,10 @@ def render_power_chart(
         target_n: Target total enrollment.
         actual_n: Current actual enrollment.
     """
-    sizes, powers = generate_power_curve(
+    # Deferred to keep Plotly out of app start-up
+    import plotly.graph_objects as go
+
+    sizes, powers = _cached_power_curve(
         max_n=max(200, target_n + 50),
         effect_size=effect_size,
         alpha=alpha,
@@ -380,7 +630,7 @@ def render_power_chart(
     # Power curve
     fig.add_trace(go.Scatter(
         x=sizes,
-        y=[p * 100 for p in powers],
+        y=np.asarray(powers) * 100,
         mode='lines',
         name='Power',
         line=dict(color='#3B82F6', width=3),
@@ -399,12 +649,18 @@ def render_power_chart(
 
     # Current enrollment marker (at ACTUAL enrollment, not target)
     if actual_n > 0:
-        from src.analysis.power_analysis import calculate_power_two_sample
-        current_power = calculate_power_two_sample(
-            actual_n // 2, effect_size, alpha
-        ) * 100
+        # Interpolate from the curve rather than re-evaluating the CDF;
+        # np.interp clamps outside the grid, so compute those exactly
+        n_per_group = actual_n // 2
+        if sizes[0] <= n_per_group <= sizes[-1]:
+            current_power = float(np.interp(n_per_group, sizes, powers))
+        else:
+            current_power = calculate_power_two_sample(
+                n_per_group, effect_size, alpha
+            )
+        current_power *= 100
         fig.add_trace(go.Scatter(
-            x=[actual_n // 2],
+            x=[n_per_group],
             y=[current_power],
             mode='markers',
             name='Current Trial',
@@ -427,6 +683,8 @@ def render_power_chart(
 
 def render_budget_chart(budget_result):
     """Render the budget donut chart."""
+    import plotly.graph_objects as go
+
     labels = ['Spent', 'Remaining']
     values = [budget_result.spent_to_date, budget_result.remaining]
     colors = ['#3B82F6', '#E5E7EB']
@@ -458,59 +716,83 @@ def render_budget_chart(budget_result):
     return fig
 
 
-def render_enrollment_chart(trial: dict, enrollment_actual: int):
-    """Render enrollment forecast chart.
+def get_forecast_args(
+    trial: dict,
+    enrollment_actual: int,
+    start_dt: datetime = None,
+    days_since_start: int = None,
+    today: date = None
+) -> dict:
+    """Resolve the simulation and forecast inputs for a trial.
 
     Args:
         trial: Trial data dictionary.
         enrollment_actual: Current actual enrollment count.
-    """
-    # Generate synthetic data for demo
-    # NOTE: ClinicalTrials.gov doesn't provide historical enrollment data
-    # We simulate a realistic trajectory for demonstration purposes
-
-    start_date_str = trial.get('start_date', '2024-01-01')
-    if not start_date_str:
-        start_date_str = '2024-01-01'
+        start_dt: Parsed trial start date (defaults to 2024-01-01).
+        days_since_start: Days from trial start to today.
+        today: Current date (defaults to today).
 
-    # Parse start date
-    try:
-        if len(start_date_str) == 7:  # YYYY-MM format
-            start_date_str = f"{start_date_str}-01"
-        start_dt = datetime.strptime(start_date_str, "%Y-%m-%d")
-    except ValueError:
+    Returns:
+        dict: Keyword arguments for _cached_forecast().
+    """
+    if start_dt is None:
         start_dt = datetime(2024, 1, 1)
-        start_date_str = '2024-01-01'
+        days_since_start = None
+    if days_since_start is None:
+        if today is None:
+            today = date.today()
+        days_since_start = (today - start_dt.date()).days
+
+    # Seed from a stable checksum; str hash() is randomized per process
+    nct_id = trial.get('nct_id', '')
+
+    return {
+        "seed": zlib.crc32(nct_id.encode()) % 10000,
+        "start_date_str": start_dt.strftime("%Y-%m-%d"),
+        "target": trial.get('enrollment_target', 100) or 100,
+        # Cap at reasonable range (don't simulate more than 3 years back)
+        "days_elapsed": min(max(days_since_start, 30), 1095),
+        "final_enrollment": enrollment_actual,
+        "forecast_days": 365
+    }
 
-    target = trial.get('enrollment_target', 100) or 100
 
-    # Calculate days elapsed from trial start to today
-    today = datetime.now()
-    days_since_start = (today - start_dt).days
+def render_enrollment_chart(
+    trial: dict,
+    enrollment_actual: int,
+    start_dt: datetime = None,
+    days_since_start: int = None,
+    today: date = None
+):
+    """Render enrollment forecast chart.
 
-    # Cap at reasonable range (don't simulate more than 3 years back)
-    days_elapsed = min(max(days_since_start, 30), 1095)
+    Args:
+        trial: Trial data dictionary.
+        enrollment_actual: Current actual enrollment count.
+        start_dt: Parsed trial start date (defaults to 2024-01-01).
+        days_since_start: Days from trial start to today.
+        today: Current date (defaults to today).
+    """
+    import plotly.graph_objects as go
 
-    # Generate synthetic enrollment history ending at actual enrollment
-    history = generate_synthetic_enrollment(
-        start_date=start_date_str,
-        target=target,
-        days_elapsed=days_elapsed,
-        seed=hash(trial.get('nct_id', '')) % 10000,
-        final_enrollment=enrollment_actual
+    # Generate synthetic data for demo
+    # NOTE: ClinicalTrials.gov doesn't provide historical enrollment data
+    # We simulate a realistic trajectory for demonstration purposes
+    forecast_args = get_forecast_args(
+        trial, enrollment_actual, start_dt, days_since_start, today
     )
+    target = forecast_args['target']
 
-    # Generate forecast series
-    series = generate_forecast_series(
-        enrollment_history=history,
-        target_enrollment=target,
-        forecast_days=365
-    )
+    # Synthetic enrollment history ending at actual enrollment, plus forecast
+    series = _cached_forecast(**forecast_args)
+
+    # Partition into actual and forecast rows in a single pass
+    by_type = dict(tuple(series.groupby('type', sort=False)))
+    actual, forecast = by_type['actual'], by_type['forecast']
 
     fig = go.Figure()
 
     # Actual enrollment
-    actual = series[series['type'] == 'actual']
     fig.add_trace(go.Scatter(
         x=actual['date'],
         y=actual['enrolled'],
@@ -520,7 +802,6 @@ def render_enrollment_chart(trial: dict, enrollment_actual: int):
     ))
 
     # Forecast
-    forecast = series[series['type'] == 'forecast']
     fig.add_trace(go.Scatter(
         x=forecast['date'],
         y=forecast['enrolled'],
@@ -531,8 +812,12 @@ def render_enrollment_chart(trial: dict, enrollment_actual: int):
 
     # Confidence interval
     fig.add_trace(go.Scatter(
-        x=list(forecast['date']) + list(forecast['date'][::-1]),
-        y=list(forecast['ci_upper']) + list(forecast['ci_lower'][::-1]),
+        x=np.concatenate([
+            forecast['date'].values, forecast['date'].values[::-1]
+        ]),
+        y=np.concatenate([
+            forecast['ci_upper'].values, forecast['ci_lower'].values[::-1]
+        ]),
         fill='toself',
         fillcolor='rgba(59, 130, 246, 0.35)',
         line=dict(color='rgba(59, 130, 246, 0.5)'),
@@ -562,6 +847,44 @@ def render_enrollment_chart(trial: dict, enrollment_actual: int):
     return fig
 
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _build_power_fig(
+    effect_size: float,
+    alpha: float,
+    target_n: int,
+    actual_n: int
+):
+    """Build the power curve figure, shared across reruns with equal inputs."""
+    return render_power_chart(effect_size, alpha, target_n, actual_n)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _build_budget_fig(
+    spent_to_date: float,
+    remaining: float,
+    total_budget: float,
+    _budget_result
+):
+    """Build the budget donut figure, keyed on the plotted budget figures."""
+    return render_budget_chart(_budget_result)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _build_enrollment_fig(
+    nct_id: str,
+    enrollment_target: int,
+    enrollment_actual: int,
+    start_dt: datetime,
+    days_since_start: int,
+    today: date,
+    _trial: dict
+):
+    """Build the enrollment forecast figure, keyed on its scalar inputs."""
+    return render_enrollment_chart(
+        _trial, enrollment_actual, start_dt, days_since_start, today
+    )
+
+
 def render_trial_details(trial: dict):
     """Render trial details section."""
     st.markdown("### 📄 Trial Details")
@@ -597,37 +920,63 @@ def render_ai_summary(
     st.markdown("### 🤖 AI-Powered Trial Summary")
 
     # Check for API key
-    import os
-    has_api_key = bool(os.getenv("OPENAI_API_KEY"))
-
-    # Auto-generate summary for the current trial
-    current_nct = trial.get('nct_id', '')
-    cached_nct = st.session_state.get('summary_nct_id', '')
-
-    # Generate if trial changed or no summary exists
-    if current_nct != cached_nct or not st.session_state.get("ai_summary"):
-        with st.spinner("Generating executive summary..."):
-            summary, source = get_trial_summary(
-                trial_data=trial,
-                power_result=power_result,
-                budget_result=budget_result,
-                forecast_result=forecast_result,
-                use_ai=has_api_key
-            )
+    has_api_key = is_ai_available()
+
+    nct_id = trial.get('nct_id', '')
+    power_pct = round(power_result['power_at_actual'], 2)
+    spent_bucket = round(budget_result.spent_to_date, 0)
+
+    # Stream AI summaries as they are generated; the completed text is
+    # kept in session state so reruns with the same inputs are instant.
+    # Failures are kept too, so reruns use the template instead of
+    # retrying a request that may take the full timeout again.
+    streamed = st.session_state.setdefault("streamed_summaries", {})
+    failed = st.session_state.setdefault("failed_summaries", {})
+    stream_key = (nct_id, power_pct, spent_bucket)
+
+    if has_api_key and stream_key not in streamed and stream_key not in failed:
+        stream_box = st.empty()
+        try:
+            with stream_box.container():
+                streamed[stream_key] = st.write_stream(
+                    stream_trial_summary(
+                        trial_data=trial,
+                        power_result=power_result,
+                        budget_result=budget_result,
+                        forecast_result=forecast_result
+                    )
+                )
+        except Exception as e:
+            failed[stream_key] = str(e)
+        stream_box.empty()
+
+    if stream_key in failed:
+        st.warning(
+            f"AI summary unavailable ({failed[stream_key]}). "
+            f"Showing the template summary instead."
+        )
 
-            # Cache the summary
-            st.session_state.ai_summary = summary
-            st.session_state.ai_source = source
-            st.session_state.summary_nct_id = current_nct
+    if stream_key in streamed:
+        summary, source = streamed[stream_key], "ai"
+    else:
+        # Fall back to template
+        summary, source = _cached_summary(
+            nct_id=nct_id,
+            power_pct=power_pct,
+            spent_bucket=spent_bucket,
+            _trial=trial,
+            _power_result=power_result,
+            _budget_result=budget_result,
+            _forecast_result=forecast_result
+        )
 
     # Display summary
-    source = st.session_state.get("ai_source", "template")
     source_label = "🤖 AI Generated" if source == "ai" else "📋 Template"
 
     st.markdown(
         f'<div class="info-box">'
         f'<strong>{source_label}</strong><br><br>'
-        f'{st.session_state.ai_summary}'
+        f'{summary}'
         f'</div>',
         unsafe_allow_html=True
     )
@@ -635,7 +984,11 @@ def render_ai_summary(
 
 def main():
     """Main dashboard application."""
-    render_header()
+    now = datetime.now()
+    today = now.date()
+
+    inject_css()
+    render_header(now)
     st.markdown("---")
 
     # Sidebar returns parameters
@@ -645,10 +998,25 @@ def main():
     if st.session_state.get("selected_nct_id"):
         # Get trial details
         nct_id = st.session_state.selected_nct_id
-        trial = next(
-            (t for t in st.session_state.trials if t['nct_id'] == nct_id),
-            None
-        )
+        trial = st.session_state.trials_by_id.get(nct_id)
+
+        # Backfill fields missing from the search results
+        if trial and not all(trial.get(k) for k in BACKFILL_FIELDS):
+            try:
+                details = _cached_trial_details(nct_id)
+                trial = {
+                    **trial,
+                    **{
+                        k: v for k, v in details.items()
+                        if v and not trial.get(k)
+                    }
+                }
+            except Exception as e:
+                st.warning(
+                    f"Could not load site, condition and intervention "
+                    f"details for {nct_id} ({e}). The budget uses a "
+                    f"default of 10 sites."
+                )
 
         if trial:
             # Display trial title
@@ -661,41 +1029,51 @@ def main():
 
             # Use real enrollment if available, otherwise estimate based on
             # trial duration (recruiting trials typically ~60% enrolled)
-            if enrollment_type == 'ACTUAL':
-                # This IS the real current enrollment
-                enrollment_actual = enrollment_target
-            else:
-                # Estimate based on trial progress
-                start_date = trial.get('start_date', '')
-                if start_date:
-                    try:
-                        if len(start_date) == 7:
-                            start_date = f"{start_date}-01"
-                        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                        days_elapsed = (datetime.now() - start_dt).days
-                        # Estimate ~60% enrollment for active trials
-                        progress_ratio = min(0.85, max(0.3, days_elapsed / 1095))
-                        enrollment_actual = int(enrollment_target * progress_ratio)
-                    except ValueError:
-                        enrollment_actual = int(enrollment_target * 0.6)
-                else:
-                    enrollment_actual = int(enrollment_target * 0.6)
-
-            power_result = analyze_trial_power(
-                enrollment_target=enrollment_target,
-                enrollment_actual=enrollment_actual,
-                effect_size=params['effect_size'],
-                alpha=params['alpha']
+            enrollment_actual, start_dt, days_elapsed = (
+                _estimate_enrollment_actual(
+                    trial.get('start_date', ''),
+                    enrollment_target,
+                    enrollment_type,
+                    today
+                )
             )
 
-            budget_result = calculate_budget(
-                phase=trial.get('phase', 'NA'),
-                enrollment_target=enrollment_target,
-                enrollment_actual=enrollment_actual,
-                sites_count=sites_count,
-                months_elapsed=6,
-                scenario=params['cost_scenario']
-            )
+            # The analyses are independent, so run them concurrently. Worker
+            # threads share this run's context so cached calls behave as
+            # they do on the script thread.
+            with ThreadPoolExecutor(
+                max_workers=3,
+                initializer=add_script_run_ctx,
+                initargs=(None, get_script_run_ctx())
+            ) as executor:
+                power_future = executor.submit(
+                    analyze_trial_power,
+                    enrollment_target=enrollment_target,
+                    enrollment_actual=enrollment_actual,
+                    effect_size=params['effect_size'],
+                    alpha=params['alpha']
+                )
+                budget_future = executor.submit(
+                    calculate_budget,
+                    phase=trial.get('phase', 'NA'),
+                    enrollment_target=enrollment_target,
+                    enrollment_actual=enrollment_actual,
+                    sites_count=sites_count,
+                    months_elapsed=6,
+                    scenario=params['cost_scenario']
+                )
+                # Warms the forecast cache used by the enrollment chart
+                forecast_future = executor.submit(
+                    _cached_forecast,
+                    **get_forecast_args(
+                        trial, enrollment_actual, start_dt, days_elapsed,
+                        today
+                    )
+                )
+
+                power_result = power_future.result()
+                budget_result = budget_future.result()
+                forecast_future.result()
 
             # ROW 1: Key Metrics
             render_metrics(trial, power_result, budget_result, enrollment_actual)
@@ -705,7 +1083,7 @@ def main():
             col1, col2 = st.columns(2)
 
             with col1:
-                power_fig = render_power_chart(
+                power_fig = _build_power_fig(
                     effect_size=params['effect_size'],
                     alpha=params['alpha'],
                     target_n=enrollment_target,
@@ -714,12 +1092,25 @@ def main():
                 st.plotly_chart(power_fig, use_container_width=True)
 
             with col2:
-                budget_fig = render_budget_chart(budget_result)
+                budget_fig = _build_budget_fig(
+                    budget_result.spent_to_date,
+                    budget_result.remaining,
+                    budget_result.total_budget,
+                    budget_result
+                )
                 st.plotly_chart(budget_fig, use_container_width=True)
 
             # ROW 3: Enrollment Forecast
             st.markdown("---")
-            enrollment_fig = render_enrollment_chart(trial, enrollment_actual)
+            enrollment_fig = _build_enrollment_fig(
+                trial.get('nct_id', ''),
+                enrollment_target,
+                enrollment_actual,
+                start_dt,
+                days_elapsed,
+                today,
+                trial
+            )
             st.plotly_chart(enrollment_fig, use_container_width=True)
 
             # ROW 4: Trial Details and AI Summary
@@ -1,19 +1,173 @@
 # src/ai/summarizer.py
 """AI-powered trial summary generation using OpenAI GPT-4."""
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Optional
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
-# Initialize OpenAI client
+# OpenAI client and .env loading are deferred until first AI use so the
+# template path never pays for importing the SDK
 client = None
+_env_loaded = False
 
+# Outcome of the last API attempt: None until known, False once the key
+# has been rejected so later calls skip straight to the template
+_ai_available: Optional[bool] = None
 
-def get_client() -> OpenAI:
+# Exact-match response cache: hash of request -> summary text
+_summary_cache = {}
+_SUMMARY_CACHE_SIZE = 256
+
+# Near-duplicate cache: (model, trial, risk band) -> [(metrics, summary)]
+_similar_cache = {}
+_SIMILAR_TOLERANCE_PCT = 2.0
+
+# Both caches are shared by concurrent Streamlit sessions; writes and
+# evictions go through this lock
+_cache_lock = threading.Lock()
+
+# Seconds before an OpenAI request is abandoned (SDK default is 600)
+REQUEST_TIMEOUT = 30.0
+
+# A 5-6 sentence briefing runs 150-250 tokens, a little more as JSON;
+# the cap only stops runaways, and output cut off by it is discarded
+MAX_COMPLETION_TOKENS = 350
+
+
+class SummaryTruncatedError(RuntimeError):
+    """Raised when a summary stops at the completion token limit."""
+
+
+# Structured briefing for non-streaming requests: one field per section,
+# joined in order into the final prose
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "situation": {"type": "string"},
+        "complication": {"type": "string"},
+        "implication": {"type": "string"},
+        "recommendation1": {"type": "string"},
+        "recommendation2": {"type": "string"},
+    },
+    "required": [
+        "situation",
+        "complication",
+        "implication",
+        "recommendation1",
+        "recommendation2",
+    ],
+    "additionalProperties": False,
+}
+SUMMARY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "briefing",
+        "schema": SUMMARY_SCHEMA,
+        "strict": True,
+    },
+}
+
+# Risk tiers by severity, indexed by _risk_index(): (label, emoji)
+_RISK_LEVELS = (
+    ("ON TRACK", "🟢"),
+    ("MODERATE RISK", "🟡"),
+    ("HIGH RISK", "🔴"),
+)
+
+# Template sentences per risk tier, in _RISK_LEVELS order
+_COMPLICATION_TEMPLATES = (
+    "Statistical power is healthy at {power_pct:.0f}%, exceeding "
+    "the 80% threshold required for robust detection of treatment "
+    "effects.",
+    "Statistical power is at {power_pct:.0f}%, below the 80% "
+    "threshold, which poses a moderate risk to the study's ability "
+    "to demonstrate treatment efficacy.",
+    "The current statistical power stands at just {power_pct:.0f}%, "
+    "critically below the 80% threshold required for scientific "
+    "validity, meaning the study risks failing to detect a true "
+    "treatment effect even if one exists.",
+)
+_RECOMMENDATION_TEMPLATES = (
+    "The study is performing well; maintain current operational "
+    "tempo while monitoring for any site-level variations that "
+    "could impact the enrollment trajectory. Continue monthly "
+    "progress reviews and prepare interim analysis protocols to "
+    "capitalize on the strong enrollment foundation.",
+    "To achieve adequate power, focus on optimizing existing site "
+    "performance through weekly enrollment reviews and targeted "
+    "recruitment campaigns in high-performing geographies. "
+    "Maintaining current trajectory with these enhancements should "
+    "bring the study to 80% power within the planned timeline, "
+    "though quarterly progress reviews are recommended.",
+    "Immediate intervention is required: consider adding 2-3 new "
+    "clinical sites, increasing patient referral incentives by "
+    "15-20%, and expanding eligibility criteria where clinically "
+    "appropriate. Without accelerated enrollment of approximately "
+    "{shortfall} additional patients, this study faces significant "
+    "risk of producing inconclusive results and should be flagged for "
+    "executive review within 30 days.",
+)
+
+
+def get_api_key() -> Optional[str]:
+    """Return the OpenAI API key, loading .env on first use.
+
+    Returns:
+        Optional[str]: OPENAI_API_KEY value, or None if not set.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    return os.getenv("OPENAI_API_KEY")
+
+
+def _require_api_key() -> str:
+    """Return the API key or raise if it is not configured."""
+    api_key = get_api_key()
+    if not api_key:
+        raise ValueError(
+            "OPENAI_API_KEY not found. "
+            "Set it in .env file or environment."
+        )
+    return api_key
+
+
+def reset_ai_probe() -> None:
+    """Forget a cached API key rejection, e.g. after fixing the key."""
+    global _ai_available
+    _ai_available = None
+
+
+def is_ai_available() -> bool:
+    """Check whether AI summaries should be attempted.
+
+    Returns:
+        bool: True if an API key is configured and has not been rejected.
+    """
+    return _ai_available is not False and bool(get_api_key())
+
+
+def _record_api_error(error: Exception) -> None:
+    """Disable AI for the session if the API rejected the credentials."""
+    global _ai_available
+    from openai import AuthenticationError, PermissionDeniedError
+
+    # Rate limits and timeouts are transient; only auth failures stick
+    if isinstance(error, (AuthenticationError, PermissionDeniedError)):
+        _ai_available = False
+
+
+def get_client() -> "OpenAI":
     """Get or create OpenAI client.
 
     Returns:
@@ -24,27 +178,437 @@ def get_client() -> OpenAI:
     """
     global client
     if client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY not found. "
-                "Set it in .env file or environment."
-            )
-        client = OpenAI(api_key=api_key)
+        from openai import OpenAI
+
+        # One long-lived client so repeat calls reuse its pooled
+        # keep-alive connections instead of new TLS handshakes
+        client = OpenAI(
+            api_key=_require_api_key(),
+            timeout=REQUEST_TIMEOUT
+        )
     return client
 
 
+# Static instructions sent verbatim on every request as the system
+# message, so the per-trial user message carries only the metrics. At
+# ~200 tokens this is well below the 1024-token minimum for OpenAI's
+# prompt caching; the split is for keeping instructions and data apart.
+STATIC_PREFIX = """You are a senior clinical trial strategist briefing pharma \
+leadership. Using the trial metrics in the user message, write a 5-6 \
+sentence executive summary:
+1. Situation (1 sentence): start with the RISK emoji and label \
+(e.g. "🔴 HIGH RISK:"), then trial name, phase and enrollment %.
+2. Complication (1-2): the key risk. If power < 80%, stress that the \
+trial may fail to detect a true effect, wasting the investment; \
+otherwise highlight the positive trajectory.
+3. Implication (1): if trends continue, will enrollment hit target? \
+Tie runway to completion feasibility.
+4. Recommendation (2): specific actions (add sites, referral \
+incentives, broader eligibility, etc.) and the expected outcome.
+Style: direct and authoritative, specific numbers ($, %, timeframes), \
+no filler, link metrics to business impact. Flowing prose, no bullets \
+or headers."""
+
+
+def _risk_index(power_pct: float, is_underpowered: bool) -> int:
+    """Return the _RISK_LEVELS index: 0 on track, 1 moderate, 2 high."""
+    return int(is_underpowered) + int(is_underpowered and power_pct < 50)
+
+
+def classify_risk(power_pct: float, is_underpowered: bool) -> tuple[str, str]:
+    """Classify a trial's risk from its statistical power.
+
+    Shared by the AI prompt and the template summary via AnalysisBundle.
+
+    Args:
+        power_pct: Power at current enrollment, in percent.
+        is_underpowered: Whether power is below the 80% target.
+
+    Returns:
+        tuple: (risk_level, risk_emoji), e.g. ("HIGH RISK", "🔴").
+    """
+    return _RISK_LEVELS[_risk_index(power_pct, is_underpowered)]
+
+
+def _join_briefing(content: str) -> str:
+    """Join a SUMMARY_SCHEMA JSON response into summary prose."""
+    briefing = json.loads(content)
+    return " ".join(briefing[key] for key in SUMMARY_SCHEMA["required"])
+
+
+def _as_budget_dict(budget_result) -> dict:
+    """Return budget figures as a dict, accepting a BudgetResult."""
+    if hasattr(budget_result, "to_dict"):
+        return budget_result.to_dict()
+    return budget_result
+
+
+@dataclass(slots=True)
+class AnalysisBundle:
+    """A trial's analysis results plus the metrics derived from them.
+
+    Built once per trial so the prompt, cache key and template summary
+    share the same derived values instead of recomputing them.
+    """
+
+    # Source results
+    trial: dict
+    power: dict
+    budget: dict
+    forecast: Optional[dict]
+
+    # Derived metrics
+    enrollment_target: int
+    enrollment_actual: int
+    enrollment_pct: float
+    power_pct: float
+    is_underpowered: bool
+    budget_pct: float
+    risk: int
+
+    @classmethod
+    def from_results(
+        cls,
+        trial_data: dict,
+        power_result: dict,
+        budget_result,
+        forecast_result: Optional[dict] = None
+    ) -> "AnalysisBundle":
+        """Bundle analysis results and derive the shared metrics.
+
+        Args:
+            trial_data: Trial information from parse_trial_summary().
+            power_result: Power analysis from analyze_trial_power().
+            budget_result: BudgetResult or its to_dict() form.
+            forecast_result: Optional enrollment forecast results.
+
+        Returns:
+            AnalysisBundle: Results with derived metrics.
+        """
+        budget = _as_budget_dict(budget_result)
+        target = trial_data.get("enrollment_target", 0)
+        actual = power_result.get("n_per_group_actual", 0) * 2
+        power_pct = power_result.get("power_at_actual", 0) * 100
+        is_underpowered = power_result.get("is_underpowered", True)
+        spent = budget.get("spent_to_date", 0)
+        total = budget.get("total_budget", 0)
+
+        return cls(
+            trial=trial_data,
+            power=power_result,
+            budget=budget,
+            forecast=forecast_result,
+            enrollment_target=target,
+            enrollment_actual=actual,
+            enrollment_pct=actual / target * 100 if target > 0 else 0,
+            power_pct=power_pct,
+            is_underpowered=is_underpowered,
+            budget_pct=spent / total * 100 if total > 0 else 0,
+            risk=_risk_index(power_pct, is_underpowered),
+        )
+
+    @property
+    def risk_level(self) -> str:
+        """Risk label, e.g. "HIGH RISK"."""
+        return classify_risk(self.power_pct, self.is_underpowered)[0]
+
+    @property
+    def risk_emoji(self) -> str:
+        """Risk indicator emoji."""
+        return classify_risk(self.power_pct, self.is_underpowered)[1]
+
+
+def analyze_trial(
+    trial_data: dict,
+    enrollment_actual: int,
+    months_elapsed: float,
+    effect_size: float = 0.5,
+    alpha: float = 0.05,
+    scenario: str = "median",
+    forecast_result: Optional[dict] = None
+) -> AnalysisBundle:
+    """Run power and budget analysis for one trial in a single pass.
+
+    Convenience for portfolio runs: reads the trial fields once and
+    returns everything the summary functions need.
+
+    Args:
+        trial_data: Trial information from parse_trial_summary().
+        enrollment_actual: Current actual enrollment (both arms).
+        months_elapsed: Months since trial start.
+        effect_size: Expected Cohen's d effect size.
+        alpha: Significance level.
+        scenario: Cost scenario - 'low', 'median', 'high'.
+        forecast_result: Optional enrollment forecast results.
+
+    Returns:
+        AnalysisBundle: Power and budget results with derived metrics.
+    """
+    # Imported here so template-only users of this module skip SciPy
+    from src.analysis.cost_model import calculate_budget
+    from src.analysis.power_analysis import analyze_trial_power
+
+    target = trial_data.get("enrollment_target", 0)
+    power_result = analyze_trial_power(
+        target, enrollment_actual, effect_size, alpha
+    )
+    budget_result = calculate_budget(
+        trial_data.get("phase", "NA"),
+        target,
+        enrollment_actual,
+        trial_data.get("sites_count", 0),
+        months_elapsed,
+        scenario
+    )
+    return AnalysisBundle.from_results(
+        trial_data, power_result, budget_result, forecast_result
+    )
+
+
+def build_summary_messages(
+    trial_data: dict,
+    power_result: dict,
+    budget_result: dict,
+    forecast_result: Optional[dict] = None
+) -> list:
+    """Build the chat messages for an executive summary request.
+
+    Args:
+        trial_data: Trial information from parse_trial_summary().
+        power_result: Power analysis from analyze_trial_power().
+        budget_result: Budget analysis (BudgetResult.to_dict()).
+        forecast_result: Optional enrollment forecast results.
+
+    Returns:
+        list: System and user messages for the chat completions API.
+    """
+    return _build_messages(AnalysisBundle.from_results(
+        trial_data, power_result, budget_result, forecast_result
+    ))
+
+
+def _build_messages(bundle: AnalysisBundle) -> list:
+    """Build the chat messages for a bundled trial analysis."""
+    trial = bundle.trial
+    title = trial.get("title", "Unknown Trial")
+    phase = trial.get("phase", "N/A")
+
+    spent = bundle.budget.get("spent_to_date", 0)
+    total = bundle.budget.get("total_budget", 0)
+    runway = bundle.budget.get("runway_months")
+    runway = f"{runway:.1f}" if runway is not None else "N/A"
+    efficiency = bundle.budget.get("efficiency_ratio", 1.0)
+
+    # Completion date
+    forecast = bundle.forecast
+    if forecast and forecast.get("completion_date"):
+        completion = forecast["completion_date"].strftime("%B %Y")
+    else:
+        completion = trial.get("completion_date", "TBD")
+
+    # Trial-specific metrics go last so the static prefix stays cacheable
+    prompt = f"""TRIAL: {title}
+PHASE: {phase}
+- Enrollment: {bundle.enrollment_actual}/{bundle.enrollment_target} ({bundle.enrollment_pct:.0f}%)
+- Power: {bundle.power_pct:.1f}% (standard 80%)
+- Budget spent: ${spent:,.0f} of ${total:,.0f} ({bundle.budget_pct:.0f}%)
+- Runway: {runway} months
+- Efficiency: {efficiency:.2f}x
+- Projected completion: {completion}
+RISK: {bundle.risk_emoji} {bundle.risk_level}"""
+
+    return [
+        {"role": "system", "content": STATIC_PREFIX},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _summary_cache_key(messages: list, model: str) -> str:
+    """Hash the exact request payload into a cache key."""
+    payload = json.dumps([messages, model], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8")).hexdigest()
+
+
+def _similarity_signature(bundle: AnalysisBundle, model: str) -> tuple:
+    """Split a bundled analysis into a bucket key and a metric vector.
+
+    Returns:
+        tuple: (bucket, metrics) where bucket holds the fields that must
+            match exactly and metrics holds enrollment, power and budget
+            percentages compared within a tolerance.
+    """
+    bucket = (
+        model,
+        bundle.trial.get("nct_id") or bundle.trial.get("title"),
+        bundle.trial.get("phase"),
+        bundle.risk
+    )
+    metrics = (bundle.enrollment_pct, bundle.power_pct, bundle.budget_pct)
+    return bucket, metrics
+
+
+def _find_similar_summary(bucket: tuple, metrics: tuple) -> Optional[str]:
+    """Return a cached summary whose metrics all lie within tolerance."""
+    for cached_metrics, summary in _similar_cache.get(bucket, ()):
+        if all(
+            abs(a - b) <= _SIMILAR_TOLERANCE_PCT
+            for a, b in zip(cached_metrics, metrics)
+        ):
+            return summary
+    return None
+
+
+class SummaryStream:
+    """Single-use iterable of summary text chunks.
+
+    Iterate it to render tokens as they arrive (e.g. with
+    st.write_stream), or call collect() to block for the full text.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[str]:
+        return self._chunks
+
+    def collect(self) -> str:
+        """Consume the stream and return the complete summary."""
+        return "".join(self._chunks).strip()
+
+
+def _store_summary(key: str, signature: tuple, summary: str) -> None:
+    """Record a finished summary in the exact and near-duplicate caches."""
+    bucket, metrics = signature
+
+    with _cache_lock:
+        if len(_summary_cache) >= _SUMMARY_CACHE_SIZE:
+            _summary_cache.pop(next(iter(_summary_cache)))
+        _summary_cache[key] = summary
+
+        if bucket not in _similar_cache and (
+            len(_similar_cache) >= _SUMMARY_CACHE_SIZE
+        ):
+            _similar_cache.pop(next(iter(_similar_cache)))
+        _similar_cache.setdefault(bucket, []).append((metrics, summary))
+
+
+def _summary_chunks(
+    messages: list,
+    model: str,
+    signature: tuple,
+    bypass_cache: bool
+) -> Iterator[str]:
+    """Yield summary text, from cache if possible, else from the API."""
+    # Identical inputs produce an identical prompt, so reuse the answer.
+    # The same trial with metrics that drifted by a point or two would get
+    # an essentially identical briefing.
+    key = _summary_cache_key(messages, model)
+    if not bypass_cache:
+        cached = _summary_cache.get(key) or _find_similar_summary(*signature)
+        if cached is not None:
+            yield cached
+            return
+
+    global _ai_available
+    openai_client = get_client()
+    try:
+        stream = openai_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_completion_tokens=MAX_COMPLETION_TOKENS,
+            temperature=0.7,
+            stream=True
+        )
+    except Exception as e:
+        _record_api_error(e)
+        raise
+    _ai_available = True
+
+    parts = []
+    finish_reason = None
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        finish_reason = choice.finish_reason or finish_reason
+        if choice.delta.content:
+            parts.append(choice.delta.content)
+            yield parts[-1]
+
+    # Cut-off prose must not be cached or presented as a summary
+    if finish_reason == "length":
+        raise SummaryTruncatedError(
+            "Summary exceeded the completion token limit"
+        )
+
+    summary = "".join(parts).strip()
+    if summary:
+        _store_summary(key, signature, summary)
+
+
+def stream_trial_summary(
+    trial_data: dict,
+    power_result: dict,
+    budget_result: dict,
+    forecast_result: Optional[dict] = None,
+    model: str = "gpt-4.1-nano",
+    bypass_cache: bool = False
+) -> SummaryStream:
+    """Stream an AI-powered executive summary as it is generated.
+
+    Yields text chunks as they arrive so callers can render
+    progressively (e.g. with st.write_stream). Cached summaries are
+    yielded as a single chunk without calling the API.
+
+    Args:
+        trial_data: Trial information from parse_trial_summary().
+        power_result: Power analysis from analyze_trial_power().
+        budget_result: Budget analysis (BudgetResult.to_dict()).
+        forecast_result: Optional enrollment forecast results.
+        model: OpenAI model (default: gpt-4.1-nano, $0.10/1M in).
+        bypass_cache: If True, skip the response cache and refresh it.
+
+    Returns:
+        SummaryStream: Iterable of summary text chunks.
+
+    Raises:
+        ValueError: If OpenAI API key not configured (on iteration).
+        SummaryTruncatedError: If the summary hit the token limit
+            (after its chunks have been yielded).
+        Exception: If API call fails (on iteration).
+    """
+    bundle = AnalysisBundle.from_results(
+        trial_data, power_result, budget_result, forecast_result
+    )
+    return _stream_bundle(bundle, model, bypass_cache)
+
+
+def _stream_bundle(
+    bundle: AnalysisBundle,
+    model: str = "gpt-4.1-nano",
+    bypass_cache: bool = False
+) -> SummaryStream:
+    """Stream the AI summary for a bundled trial analysis."""
+    messages = _build_messages(bundle)
+    signature = _similarity_signature(bundle, model)
+    return SummaryStream(
+        _summary_chunks(messages, model, signature, bypass_cache)
+    )
+
+
 def generate_trial_summary(
     trial_data: dict,
     power_result: dict,
     budget_result: dict,
     forecast_result: Optional[dict] = None,
-    model: str = "gpt-4.1-nano"
+    model: str = "gpt-4.1-nano",
+    bypass_cache: bool = False
 ) -> str:
     """Generate AI-powered executive summary for a clinical trial.
 
     Uses OpenAI GPT to create a concise 3-sentence summary
-    highlighting key trial metrics and concerns.
+    highlighting key trial metrics and concerns. Blocking wrapper
+    around stream_trial_summary().
 
     Args:
         trial_data: Trial information from parse_trial_summary().
@@ -52,125 +616,248 @@ def generate_trial_summary(
         budget_result: Budget analysis (BudgetResult.to_dict()).
         forecast_result: Optional enrollment forecast results.
         model: OpenAI model (default: gpt-4.1-nano, $0.10/1M in).
+        bypass_cache: If True, skip the response cache and refresh it.
 
     Returns:
-        str: 3-sentence executive summary.
+        str: 3-sentence executive summary, or the template summary if
+            the response was cut off at the token limit.
 
     Raises:
         ValueError: If OpenAI API key not configured.
         Exception: If API call fails.
     """
-    # Extract key metrics
-    title = trial_data.get("title", "Unknown Trial")
-    phase = trial_data.get("phase", "N/A")
-    enrollment_target = trial_data.get("enrollment_target", 0)
-    enrollment_actual = power_result.get("n_per_group_actual", 0) * 2
+    try:
+        return stream_trial_summary(
+            trial_data,
+            power_result,
+            budget_result,
+            forecast_result,
+            model=model,
+            bypass_cache=bypass_cache
+        ).collect()
 
-    power_pct = power_result.get("power_at_actual", 0) * 100
-    is_underpowered = power_result.get("is_underpowered", True)
+    except SummaryTruncatedError:
+        return generate_summary_without_api(
+            trial_data, power_result, budget_result, forecast_result
+        )
 
-    # Handle BudgetResult object or dict
-    if hasattr(budget_result, "to_dict"):
-        budget_dict = budget_result.to_dict()
-    else:
-        budget_dict = budget_result
+    except Exception as e:
+        return f"Unable to generate summary: {str(e)}"
 
-    spent = budget_dict.get("spent_to_date", 0)
-    total = budget_dict.get("total_budget", 0)
-    runway = budget_dict.get("runway_months", "N/A")
-    efficiency = budget_dict.get("efficiency_ratio", 1.0)
 
-    # Completion date
-    if forecast_result and forecast_result.get("completion_date"):
-        completion = forecast_result["completion_date"].strftime("%B %Y")
-    else:
-        completion = trial_data.get("completion_date", "TBD")
-
-    # Determine risk level
-    if is_underpowered and power_pct < 50:
-        risk_level = "HIGH RISK"
-        risk_emoji = "🔴"
-    elif is_underpowered:
-        risk_level = "MODERATE RISK"
-        risk_emoji = "🟡"
-    else:
-        risk_level = "ON TRACK"
-        risk_emoji = "🟢"
+async def generate_trial_summary_async(
+    async_client: "AsyncOpenAI",
+    trial_data: dict,
+    power_result: dict,
+    budget_result: dict,
+    forecast_result: Optional[dict] = None,
+    model: str = "gpt-4.1-nano"
+) -> str:
+    """Async variant of generate_trial_summary().
 
-    # Calculate derived metrics
-    enrollment_pct = (
-        enrollment_actual / enrollment_target * 100
-        if enrollment_target > 0 else 0
+    Args:
+        async_client: Shared AsyncOpenAI client.
+        trial_data: Trial information from parse_trial_summary().
+        power_result: Power analysis from analyze_trial_power().
+        budget_result: Budget analysis (BudgetResult.to_dict()).
+        forecast_result: Optional enrollment forecast results.
+        model: OpenAI model (default: gpt-4.1-nano, $0.10/1M in).
+
+    Returns:
+        str: Executive summary, the template summary if the response
+            was cut off at the token limit, or an error message if the
+            call fails.
+    """
+    messages = build_summary_messages(
+        trial_data,
+        power_result,
+        _as_budget_dict(budget_result),
+        forecast_result
     )
-    budget_pct = spent / total * 100 if total > 0 else 0
-    power_gap = 80 - power_pct if power_pct < 80 else 0
-    patients_needed = power_result.get("enrollment_shortfall", 0)
 
-    # Build comprehensive prompt
-    prompt = f"""You are a senior clinical trial analyst at a top consulting firm.
-Write a comprehensive executive briefing for pharma leadership.
+    try:
+        response = await async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_completion_tokens=MAX_COMPLETION_TOKENS,
+            temperature=0.7,
+            response_format=SUMMARY_RESPONSE_FORMAT
+        )
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            return generate_summary_without_api(
+                trial_data, power_result, budget_result, forecast_result
+            )
+        return _join_briefing(choice.message.content)
 
-═══════════════════════════════════════════════════════════════
-TRIAL: {title}
-PHASE: {phase}
-═══════════════════════════════════════════════════════════════
+    except Exception as e:
+        return f"Unable to generate summary: {str(e)}"
 
-CURRENT METRICS:
-• Enrollment: {enrollment_actual} of {enrollment_target} ({enrollment_pct:.0f}%)
-• Statistical Power: {power_pct:.1f}% (industry standard: 80%)
-• Budget Spent: ${spent:,.0f} of ${total:,.0f} ({budget_pct:.0f}%)
-• Runway: {runway} months remaining
-• Efficiency Ratio: {efficiency:.2f}x
-• Projected Completion: {completion}
 
-RISK CLASSIFICATION: {risk_level}
+async def _gather_summaries(
+    trials: list,
+    max_concurrency: int,
+    model: str
+) -> list:
+    """Run summary requests concurrently over one shared client."""
+    from openai import AsyncOpenAI
 
-═══════════════════════════════════════════════════════════════
-BRIEFING REQUIREMENTS:
-═══════════════════════════════════════════════════════════════
+    api_key = _require_api_key()
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-Write a 5-6 sentence executive summary covering:
+    # The SDK retries rate limits, timeouts and 5xx responses with
+    # exponential backoff (3 attempts in total)
+    async with AsyncOpenAI(
+        api_key=api_key,
+        max_retries=2,
+        timeout=REQUEST_TIMEOUT
+    ) as async_client:
+        async def bounded(item: dict) -> str:
+            async with semaphore:
+                return await generate_trial_summary_async(
+                    async_client,
+                    item["trial_data"],
+                    item["power_result"],
+                    item["budget_result"],
+                    item.get("forecast_result"),
+                    model=model
+                )
 
-1. SITUATION (1 sentence): Start with "{risk_emoji} {risk_level}:" then state the trial name, phase, and current enrollment status with percentage.
+        return await asyncio.gather(*(bounded(item) for item in trials))
 
-2. COMPLICATION (1-2 sentences): Explain the key risk. If underpowered ({power_pct:.1f}% < 80%), emphasize this threatens study validity - the trial may fail to detect a true treatment effect, wasting all investment. If power is adequate, highlight the positive trajectory.
 
-3. IMPLICATION (1 sentence): What happens if current trends continue? Will they hit enrollment targets? What's the timeline risk? Connect runway ({runway} months) to completion feasibility.
+def get_many_summaries(
+    trials: list,
+    max_concurrency: int = 10,
+    model: str = "gpt-4.1-nano"
+) -> list:
+    """Generate AI summaries for several trials concurrently.
 
-4. RECOMMENDATION (2 sentences): Provide specific, actionable next steps. Be prescriptive - don't just say "accelerate enrollment" but suggest HOW (add sites, increase referral incentives, expand eligibility criteria, etc.). End with expected outcome if recommendations are followed.
+    Issues up to `max_concurrency` requests at a time, so N trials take
+    roughly ceil(N / max_concurrency) round trips instead of N.
 
-STYLE GUIDELINES:
-- Write like a McKinsey partner briefing a pharma CEO
-- Use specific numbers (percentages, dollar amounts, timeframes)
-- Be direct and authoritative - executives want clarity, not hedging
-- Every sentence should add value - no filler
-- Connect the dots between metrics and business impact
+    Args:
+        trials: List of dicts with 'trial_data', 'power_result',
+            'budget_result' and optional 'forecast_result' keys.
+        max_concurrency: Maximum number of in-flight requests.
+        model: OpenAI model (default: gpt-4.1-nano, $0.10/1M in).
 
-OUTPUT: 5-6 flowing sentences, no bullet points, no headers."""
+    Returns:
+        list: Summary text for each trial, in input order.
 
-    try:
-        openai_client = get_client()
-        response = openai_client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a world-class clinical trial strategist. "
-                        "You provide actionable, data-driven executive "
-                        "briefings that drive decision-making. Your "
-                        "recommendations are specific and implementable."
-                    )
-                },
-                {"role": "user", "content": prompt}
-            ],
-            max_completion_tokens=500,
-            temperature=0.7
-        )
-        return response.choices[0].message.content.strip()
+    Raises:
+        ValueError: If OpenAI API key not configured.
+    """
+    return asyncio.run(_gather_summaries(trials, max_concurrency, model))
 
-    except Exception as e:
-        return f"Unable to generate summary: {str(e)}"
+
+def generate_trial_summaries_batch(
+    trials: list,
+    model: str = "gpt-4.1-nano",
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 60.0
+) -> dict:
+    """Generate AI summaries for many trials through the OpenAI Batch API.
+
+    Submits one chat completion per trial as a single JSONL batch and
+    polls until it finishes. Batches are billed at a discount and are
+    not subject to per-request rate limits, but may take up to 24 hours,
+    so this is intended for portfolio runs rather than interactive use.
+
+    Args:
+        trials: List of dicts with 'trial_data', 'power_result',
+            'budget_result' and optional 'forecast_result' keys.
+        model: OpenAI model (default: gpt-4.1-nano, $0.10/1M in).
+        poll_interval: Initial seconds between status checks.
+        max_poll_interval: Upper bound for the exponential backoff.
+
+    Returns:
+        dict: Summary text keyed by NCT ID (or list index if the trial
+            has none). Trials whose response was cut off at the token
+            limit get the template summary; trials whose request failed
+            or returned malformed output are omitted.
+
+    Raises:
+        ValueError: If OpenAI API key not configured.
+        RuntimeError: If the batch fails, expires or is cancelled.
+    """
+    lines = []
+    for i, item in enumerate(trials):
+        trial_data = item["trial_data"]
+        lines.append(json.dumps({
+            "custom_id": trial_data.get("nct_id") or str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": build_summary_messages(
+                    trial_data,
+                    item["power_result"],
+                    _as_budget_dict(item["budget_result"]),
+                    item.get("forecast_result")
+                ),
+                "max_completion_tokens": MAX_COMPLETION_TOKENS,
+                "temperature": 0.7,
+                "response_format": SUMMARY_RESPONSE_FORMAT
+            }
+        }, default=str))
+
+    openai_client = get_client()
+    batch_file = openai_client.files.create(
+        file=("trial_summaries.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = openai_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+
+    # Poll with exponential backoff until the batch reaches a final state
+    delay = poll_interval
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+        batch = openai_client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status: {batch.status}")
+
+    summaries = {}
+    if not batch.output_file_id:
+        return summaries
+
+    items_by_id = {
+        item["trial_data"].get("nct_id") or str(i): item
+        for i, item in enumerate(trials)
+    }
+
+    output = openai_client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            choice = response["body"]["choices"][0]
+            custom_id = record["custom_id"]
+            if choice.get("finish_reason") == "length":
+                item = items_by_id[custom_id]
+                summaries[custom_id] = generate_summary_without_api(
+                    item["trial_data"],
+                    item["power_result"],
+                    _as_budget_dict(item["budget_result"]),
+                    item.get("forecast_result")
+                )
+                continue
+            try:
+                summaries[custom_id] = _join_briefing(
+                    choice["message"]["content"]
+                )
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    return summaries
 
 
 def generate_summary_without_api(
@@ -187,138 +874,72 @@ def generate_summary_without_api(
     Args:
         trial_data: Trial information.
         power_result: Power analysis results.
-        budget_result: Budget analysis results.
+        budget_result: Budget analysis (BudgetResult.to_dict()).
         forecast_result: Optional enrollment forecast.
 
     Returns:
         str: Template-based 5-6 sentence summary.
     """
-    # Extract metrics
-    title = trial_data.get("title", "This trial")[:50]
-    phase = trial_data.get("phase", "N/A")
-    enrollment_target = trial_data.get("enrollment_target", 0)
-    enrollment_actual = power_result.get("n_per_group_actual", 0) * 2
-    completion = trial_data.get("completion_date", "TBD")
-
-    progress_pct = (
-        (enrollment_actual / enrollment_target * 100)
-        if enrollment_target > 0 else 0
-    )
+    return _template_summary(AnalysisBundle.from_results(
+        trial_data, power_result, budget_result, forecast_result
+    ))
 
-    power_pct = power_result.get("power_at_actual", 0) * 100
-    is_underpowered = power_result.get("is_underpowered", True)
-    shortfall = power_result.get("enrollment_shortfall", 0)
 
-    # Handle BudgetResult object or dict
-    if hasattr(budget_result, "to_dict"):
-        budget_dict = budget_result.to_dict()
-    else:
-        budget_dict = budget_result
-
-    utilization = budget_dict.get("budget_utilization", 0) * 100
-    runway = budget_dict.get("runway_months")
-    efficiency = budget_dict.get("efficiency_ratio", 1.0)
-    spent = budget_dict.get("spent_to_date", 0)
-    total = budget_dict.get("total_budget", 0)
-
-    # Determine risk level
-    if is_underpowered and power_pct < 50:
-        risk_level = "HIGH RISK"
-        risk_emoji = "🔴"
-    elif is_underpowered:
-        risk_level = "MODERATE RISK"
-        risk_emoji = "🟡"
-    else:
-        risk_level = "ON TRACK"
-        risk_emoji = "🟢"
+def _template_summary(bundle: AnalysisBundle) -> str:
+    """Build the rule-based summary for a bundled trial analysis."""
+    from src.analysis.cost_model import round_for_display
 
-    # Sentence 1: Situation (risk + enrollment)
-    s1 = (
-        f"{risk_emoji} {risk_level}: {title}, a {phase} trial, has enrolled "
-        f"{progress_pct:.0f}% of its target ({enrollment_actual} of "
-        f"{enrollment_target} patients) with a projected completion date "
-        f"of {completion}."
+    title = bundle.trial.get("title", "This trial")[:50]
+    phase = bundle.trial.get("phase", "N/A")
+    completion = bundle.trial.get("completion_date", "TBD")
+    shortfall = bundle.power.get("enrollment_shortfall", 0)
+
+    runway = round_for_display(
+        "runway_months", bundle.budget.get("runway_months")
+    )
+    efficiency = round_for_display(
+        "efficiency_ratio", bundle.budget.get("efficiency_ratio", 1.0)
     )
+    spent = bundle.budget.get("spent_to_date", 0)
+    total = bundle.budget.get("total_budget", 0)
 
-    # Sentence 2: Complication (power analysis)
-    if is_underpowered and power_pct < 50:
-        s2 = (
-            f"The current statistical power stands at just {power_pct:.0f}%, "
-            f"critically below the 80% threshold required for scientific "
-            f"validity, meaning the study risks failing to detect a true "
-            f"treatment effect even if one exists."
-        )
-    elif is_underpowered:
-        s2 = (
-            f"Statistical power is at {power_pct:.0f}%, below the 80% "
-            f"threshold, which poses a moderate risk to the study's ability "
-            f"to demonstrate treatment efficacy."
-        )
-    else:
-        s2 = (
-            f"Statistical power is healthy at {power_pct:.0f}%, exceeding "
-            f"the 80% threshold required for robust detection of treatment "
-            f"effects."
-        )
+    risk = bundle.risk
+    risk_level, risk_emoji = bundle.risk_level, bundle.risk_emoji
+
+    parts = [
+        # Situation (risk + enrollment)
+        f"{risk_emoji} {risk_level}: {title}, a {phase} trial, has enrolled "
+        f"{bundle.enrollment_pct:.0f}% of its target "
+        f"({bundle.enrollment_actual} of {bundle.enrollment_target} "
+        f"patients) with a projected completion date of {completion}.",
+        # Complication (power analysis)
+        _COMPLICATION_TEMPLATES[risk].format(power_pct=bundle.power_pct),
+    ]
 
-    # Sentence 3: Implication (what happens next)
+    # Implication (what happens next)
     if runway and runway < 6:
-        s3 = (
+        parts.append(
             f"With only {runway:.1f} months of runway remaining and "
             f"${spent:,.0f} of ${total:,.0f} budget consumed, the timeline "
             f"for achieving adequate enrollment is constrained."
         )
     elif efficiency < 1.0:
-        s3 = (
+        parts.append(
             f"Budget efficiency at {efficiency:.2f}x indicates spending "
             f"is outpacing enrollment progress, with {runway:.1f} months "
             f"of runway remaining to course-correct."
         )
     else:
-        s3 = (
+        parts.append(
             f"Budget utilization remains efficient at {efficiency:.2f}x "
             f"with {runway:.1f} months of runway, providing adequate "
             f"resources to reach enrollment targets."
         )
 
-    # Sentence 4-5: Recommendations
-    if is_underpowered and power_pct < 50:
-        s4 = (
-            f"Immediate intervention is required: consider adding 2-3 new "
-            f"clinical sites, increasing patient referral incentives by "
-            f"15-20%, and expanding eligibility criteria where clinically "
-            f"appropriate."
-        )
-        s5 = (
-            f"Without accelerated enrollment of approximately {shortfall} "
-            f"additional patients, this study faces significant risk of "
-            f"producing inconclusive results and should be flagged for "
-            f"executive review within 30 days."
-        )
-    elif is_underpowered:
-        s4 = (
-            f"To achieve adequate power, focus on optimizing existing site "
-            f"performance through weekly enrollment reviews and targeted "
-            f"recruitment campaigns in high-performing geographies."
-        )
-        s5 = (
-            f"Maintaining current trajectory with these enhancements should "
-            f"bring the study to 80% power within the planned timeline, "
-            f"though quarterly progress reviews are recommended."
-        )
-    else:
-        s4 = (
-            f"The study is performing well; maintain current operational "
-            f"tempo while monitoring for any site-level variations that "
-            f"could impact the enrollment trajectory."
-        )
-        s5 = (
-            f"Continue monthly progress reviews and prepare interim "
-            f"analysis protocols to capitalize on the strong enrollment "
-            f"foundation."
-        )
+    # Recommendations
+    parts.append(_RECOMMENDATION_TEMPLATES[risk].format(shortfall=shortfall))
 
-    return f"{s1} {s2} {s3} {s4} {s5}"
+    return " ".join(parts)
 
 
 def get_trial_summary(
@@ -344,26 +965,34 @@ def get_trial_summary(
         tuple: (summary_text, source) where source is
             'ai' or 'template'.
     """
-    if use_ai and os.getenv("OPENAI_API_KEY"):
+    return summarize_analysis(
+        AnalysisBundle.from_results(
+            trial_data, power_result, budget_result, forecast_result
+        ),
+        use_ai=use_ai
+    )
+
+
+def summarize_analysis(bundle: AnalysisBundle, use_ai: bool = True) -> tuple:
+    """Get a summary for a bundled analysis, using AI if available.
+
+    Args:
+        bundle: Analysis from analyze_trial() or
+            AnalysisBundle.from_results().
+        use_ai: Whether to attempt AI generation.
+
+    Returns:
+        tuple: (summary_text, source) where source is
+            'ai' or 'template'.
+    """
+    if use_ai and is_ai_available():
         try:
-            summary = generate_trial_summary(
-                trial_data,
-                power_result,
-                budget_result,
-                forecast_result
-            )
-            return summary, "ai"
+            return _stream_bundle(bundle).collect(), "ai"
         except Exception:
             pass
 
     # Fallback to template
-    summary = generate_summary_without_api(
-        trial_data,
-        power_result,
-        budget_result,
-        forecast_result
-    )
-    return summary, "template"
+    return _template_summary(bundle), "template"
 
 
 if __name__ == "__main__":
@@ -409,7 +1038,7 @@ if __name__ == "__main__":
     print(summary)
 
     # Test AI if API key is set
-    if os.getenv("OPENAI_API_KEY"):
+    if get_api_key():
         print("\n3. Testing AI-powered summary:")
         print("-" * 40)
         summary, source = get_trial_summary(
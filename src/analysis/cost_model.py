@@ -1,9 +1,19 @@
 # src/analysis/cost_model.py
 """Synthetic cost model for clinical trial budget tracking."""
 
+import json
+import re
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding
+    orjson = None
+
 
 # Industry cost benchmarks (USD per patient)
 # Source: Synthetic estimates based on industry reports
@@ -19,10 +29,27 @@ COST_PER_PATIENT = {
 SITE_STARTUP_COST = 50_000  # USD per site
 MONTHLY_OVERHEAD_RATE = 0.05  # 5% of patient costs as monthly overhead
 
+# Phase numbers that have a cost table entry
+_PHASE_RE = re.compile(r"[1-4]")
+
+# COST_PER_PATIENT as a (phase, scenario) array for vectorized lookups
+_PHASE_INDEX = {key: i for i, key in enumerate(COST_PER_PATIENT)}
+_SCENARIO_INDEX = {"low": 0, "median": 1, "high": 2}
+_COST_TABLE = np.array([
+    [costs[scenario] for scenario in _SCENARIO_INDEX]
+    for costs in COST_PER_PATIENT.values()
+], dtype=float)
+# Plain-list mirror for scalar lookups (NumPy scalar indexing is slower)
+_COST_ROWS = _COST_TABLE.tolist()
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class BudgetResult:
-    """Container for budget analysis results."""
+    """Container for budget analysis results.
+
+    Figures are stored at full precision; use round_for_display() when
+    showing them or comparing them against display thresholds.
+    """
 
     # Budget figures
     total_budget: float
@@ -63,7 +90,18 @@ class BudgetResult:
             "efficiency_ratio": self.efficiency_ratio,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize straight to JSON bytes.
 
+        Uses orjson when installed, which encodes dataclasses natively
+        without building the intermediate dict.
+        """
+        if orjson is not None:
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict()).encode("utf-8")
+
+
+@lru_cache(maxsize=128)
 def normalize_phase(phase: str) -> str:
     """Normalize phase string to match cost table keys.
 
@@ -77,27 +115,13 @@ def normalize_phase(phase: str) -> str:
     if not phase:
         return "NA"
 
-    phase_upper = phase.upper().replace(" ", "")
-
-    # Handle combined phases (e.g., "Phase 2/Phase 3") - use higher phase
-    if "/" in phase_upper:
-        phases = phase_upper.split("/")
-        # Extract numbers and take max
-        nums = []
-        for p in phases:
-            for char in p:
-                if char.isdigit():
-                    nums.append(int(char))
-                    break
-        if nums:
-            return f"PHASE{max(nums)}"
-
-    # Extract phase number
-    for i in range(1, 5):
-        if str(i) in phase_upper:
-            return f"PHASE{i}"
+    nums = _PHASE_RE.findall(phase)
+    if not nums:
+        return "NA"
 
-    return "NA"
+    # Combined phases (e.g., "Phase 2/Phase 3") use the higher phase;
+    # otherwise the lowest phase number present wins
+    return f"PHASE{max(nums) if '/' in phase else min(nums)}"
 
 
 def get_cost_per_patient(
@@ -113,9 +137,8 @@ def get_cost_per_patient(
     Returns:
         float: Cost per patient in USD.
     """
-    normalized = normalize_phase(phase)
-    costs = COST_PER_PATIENT.get(normalized, COST_PER_PATIENT["NA"])
-    return costs.get(scenario, costs["median"])
+    row = _COST_ROWS[_PHASE_INDEX[normalize_phase(phase)]]
+    return row[_SCENARIO_INDEX.get(scenario, _SCENARIO_INDEX["median"])]
 
 
 def calculate_budget(
@@ -202,21 +225,103 @@ def calculate_budget(
     is_over_budget = spent_to_date > total_budget
 
     return BudgetResult(
-        total_budget=round(total_budget, 2),
-        patient_budget=round(patient_budget, 2),
-        site_budget=round(site_budget, 2),
-        spent_to_date=round(spent_to_date, 2),
-        remaining=round(remaining, 2),
-        cost_per_patient_budgeted=round(cpp_budgeted, 2),
-        cost_per_patient_actual=round(cpp_actual, 2),
-        monthly_burn_rate=round(monthly_burn, 2),
-        runway_months=round(runway, 1) if runway != float("inf") else None,
-        budget_utilization=round(budget_utilization, 4),
-        enrollment_progress=round(enrollment_progress, 4),
+        total_budget=total_budget,
+        patient_budget=patient_budget,
+        site_budget=site_budget,
+        spent_to_date=spent_to_date,
+        remaining=remaining,
+        cost_per_patient_budgeted=cpp_budgeted,
+        cost_per_patient_actual=cpp_actual,
+        monthly_burn_rate=monthly_burn,
+        runway_months=runway if runway != float("inf") else None,
+        budget_utilization=budget_utilization,
+        enrollment_progress=enrollment_progress,
         is_over_budget=is_over_budget,
-        efficiency_ratio=round(efficiency_ratio, 3),
+        efficiency_ratio=efficiency_ratio,
+    )
+
+
+def calculate_budget_vectorized(
+    phases: list,
+    enrollment_targets,
+    enrollment_actuals,
+    sites_counts,
+    months_elapsed,
+    scenario: str = "median"
+) -> dict:
+    """Calculate budget analysis for many trials at once.
+
+    Array version of calculate_budget() for portfolio sweeps. Every
+    input after phases is broadcast with NumPy, so scalars work too.
+
+    Args:
+        phases: Trial phase strings (normalized like calculate_budget).
+        enrollment_targets: Target enrollment counts.
+        enrollment_actuals: Current actual enrollments.
+        sites_counts: Numbers of study sites.
+        months_elapsed: Months since each trial started.
+        scenario: Cost scenario - 'low', 'median', 'high'.
+
+    Returns:
+        dict: Same keys as BudgetResult.to_dict(), each an array with
+            one entry per trial. runway_months is NaN where
+            calculate_budget() would return None.
+    """
+    phase_idx = np.array([
+        _PHASE_INDEX[normalize_phase(phase)] for phase in phases
+    ], dtype=np.intp)
+    scenario_idx = _SCENARIO_INDEX.get(scenario, _SCENARIO_INDEX["median"])
+    target = np.asarray(enrollment_targets, dtype=float)
+    actual = np.asarray(enrollment_actuals, dtype=float)
+    sites = np.asarray(sites_counts, dtype=float)
+    months = np.asarray(months_elapsed, dtype=float)
+
+    cpp_budgeted = _COST_TABLE[phase_idx, scenario_idx]
+
+    # Calculate budgets
+    patient_budget = cpp_budgeted * target
+    site_budget = SITE_STARTUP_COST * sites
+    overhead_budget = patient_budget * MONTHLY_OVERHEAD_RATE * 24
+    total_budget = patient_budget + site_budget + overhead_budget
+
+    # Calculate spent to date
+    patient_spent = cpp_budgeted * actual
+    overhead_spent = overhead_budget * (months / 24)
+    spent_to_date = np.minimum(
+        site_budget + patient_spent + overhead_spent, total_budget * 1.5
+    )
+    remaining = np.maximum(0, total_budget - spent_to_date)
+
+    def safe_divide(num, den, fill):
+        num, den = np.broadcast_arrays(num, den)
+        out = np.full(num.shape, fill, dtype=float)
+        return np.divide(num, den, out=out, where=den > 0)
+
+    cpp_actual = safe_divide(patient_spent + overhead_spent, actual, 0.0)
+    monthly_burn = safe_divide(spent_to_date, months, 0.0)
+    runway = safe_divide(remaining, monthly_burn, np.nan)
+    enrollment_progress = safe_divide(actual, target, 0.0)
+    budget_utilization = safe_divide(spent_to_date, total_budget, 0.0)
+    efficiency_ratio = safe_divide(
+        enrollment_progress, budget_utilization, 1.0
     )
 
+    return {
+        "total_budget": total_budget,
+        "patient_budget": patient_budget,
+        "site_budget": site_budget,
+        "spent_to_date": spent_to_date,
+        "remaining": remaining,
+        "cost_per_patient_budgeted": cpp_budgeted,
+        "cost_per_patient_actual": cpp_actual,
+        "monthly_burn_rate": monthly_burn,
+        "runway_months": runway,
+        "budget_utilization": budget_utilization,
+        "enrollment_progress": enrollment_progress,
+        "is_over_budget": spent_to_date > total_budget,
+        "efficiency_ratio": efficiency_ratio,
+    }
+
 
 def format_currency(amount: float) -> str:
     """Format amount as currency string.
@@ -235,6 +340,28 @@ def format_currency(amount: float) -> str:
         return f"${amount:.0f}"
 
 
+# Decimal places each ratio is displayed with (others default to 2)
+DISPLAY_PRECISION = {"runway_months": 1, "efficiency_ratio": 2}
+
+
+def round_for_display(field: str, value: Optional[float]) -> Optional[float]:
+    """Round a budget figure to the precision it is displayed at.
+
+    Thresholds should compare the rounded value so that, for example,
+    an efficiency shown as "1.00x" is never treated as below 1.0.
+
+    Args:
+        field: BudgetResult field name (e.g., "efficiency_ratio").
+        value: Raw figure, or None where the figure is undefined.
+
+    Returns:
+        Optional[float]: Rounded figure, or None if value is None.
+    """
+    if value is None:
+        return None
+    return round(value, DISPLAY_PRECISION.get(field, 2))
+
+
 def get_budget_summary(result: BudgetResult) -> dict:
     """Generate formatted budget summary for display.
 
@@ -244,21 +371,21 @@ def get_budget_summary(result: BudgetResult) -> dict:
     Returns:
         dict: Formatted summary with display strings.
     """
+    runway = round_for_display("runway_months", result.runway_months)
+    efficiency = round_for_display("efficiency_ratio", result.efficiency_ratio)
+
     return {
         "total_budget_display": format_currency(result.total_budget),
         "spent_display": format_currency(result.spent_to_date),
         "remaining_display": format_currency(result.remaining),
         "burn_rate_display": f"{format_currency(result.monthly_burn_rate)}/mo",
-        "runway_display": (
-            f"{result.runway_months:.1f} months"
-            if result.runway_months else "N/A"
-        ),
+        "runway_display": f"{runway:.1f} months" if runway else "N/A",
         "utilization_display": f"{result.budget_utilization:.1%}",
         "progress_display": f"{result.enrollment_progress:.1%}",
-        "efficiency_display": f"{result.efficiency_ratio:.2f}x",
+        "efficiency_display": f"{efficiency:.2f}x",
         "status": (
             "OVER BUDGET" if result.is_over_budget
-            else "ON TRACK" if result.efficiency_ratio >= 0.9
+            else "ON TRACK" if efficiency >= 0.9
             else "AT RISK"
         ),
     }
@@ -301,7 +428,7 @@ if __name__ == "__main__":
     print(f"   Spent to Date:     {format_currency(result.spent_to_date)}")
     print(f"   Remaining:         {format_currency(result.remaining)}")
     print(f"   Monthly Burn:      {format_currency(result.monthly_burn_rate)}")
-    print(f"   Runway:            {result.runway_months} months")
+    print(f"   Runway:            {result.runway_months:.1f} months")
     print(f"   Cost/Patient (B):  ${result.cost_per_patient_budgeted:,.0f}")
     print(f"   Cost/Patient (A):  ${result.cost_per_patient_actual:,.0f}")
     print(f"   Budget Used:       {result.budget_utilization:.1%}")
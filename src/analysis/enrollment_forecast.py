@@ -4,8 +4,8 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Tuple, Optional
-import statsmodels.api as sm
 
 
 def generate_synthetic_enrollment(
@@ -39,6 +39,7 @@ def generate_synthetic_enrollment(
             - day: Days since start (0-indexed)
             - enrolled: Cumulative enrollment
             - daily: Daily new enrollments
+            The day, enrolled and daily columns are int32.
     """
     if seed is not None:
         np.random.seed(seed)
@@ -62,58 +63,121 @@ def generate_synthetic_enrollment(
         # Ensure monotonic and within bounds
         enrolled_arr = np.maximum.accumulate(noisy_trajectory)
         enrolled_arr = np.clip(enrolled_arr, 0, final_enrollment)
-        enrolled_arr = np.round(enrolled_arr).astype(int)
+        enrolled_arr = np.round(enrolled_arr).astype(np.int32)
         enrolled_arr[0] = 0
         enrolled_arr[-1] = final_enrollment  # Ensure exact final value
 
-        # Build DataFrame
-        dates = [start + timedelta(days=d) for d in range(days_elapsed + 1)]
-        days_list = list(range(days_elapsed + 1))
-        enrolled_list = enrolled_arr.tolist()
-        daily_list = [0] + list(np.diff(enrolled_arr))
-
+        # Build DataFrame straight from the arrays, without copying
         return pd.DataFrame({
-            "date": dates,
-            "day": days_list,
-            "enrolled": enrolled_list,
-            "daily": daily_list
-        })
+            "date": pd.date_range(start, periods=days_elapsed + 1, freq="D"),
+            "day": np.arange(days_elapsed + 1, dtype=np.int32),
+            "enrolled": enrolled_arr,
+            "daily": np.diff(enrolled_arr, prepend=np.int32(0))
+        }, copy=False)
 
     # Original Poisson-based generation
     ideal_daily_rate = target / 547  # ~1.5 years
     actual_rate = ideal_daily_rate * enrollment_rate
 
-    dates = []
-    days = []
-    enrolled = []
-    daily = []
-
-    cumulative = 0
-
-    for d in range(days_elapsed + 1):
-        if d == 0:
-            new_patients = 0
-        else:
-            # Use Poisson distribution for realistic discrete enrollment
-            lambda_param = max(0.1, actual_rate * (1 + noise_std *
-                               np.random.randn()))
-            new_patients = np.random.poisson(lambda_param)
-
-        # Cap at target
-        new_patients = min(new_patients, target - cumulative)
-        cumulative += new_patients
+    # Draw every day's Poisson rate and arrivals in one call each
+    lambdas = np.maximum(
+        0.1, actual_rate * (1 + noise_std * np.random.randn(days_elapsed))
+    )
+    new_patients = np.concatenate(([0], np.random.poisson(lambdas)))
 
-        dates.append(start + timedelta(days=d))
-        days.append(d)
-        enrolled.append(cumulative)
-        daily.append(new_patients)
+    # Cap cumulative enrollment at target; counts and day indices fit
+    # comfortably in int32, which halves the arrays' footprint
+    enrolled = np.minimum(np.cumsum(new_patients), target).astype(np.int32)
+    daily = np.diff(enrolled, prepend=np.int32(0))
 
     return pd.DataFrame({
-        "date": dates,
-        "day": days,
+        "date": pd.date_range(start, periods=days_elapsed + 1, freq="D"),
+        "day": np.arange(days_elapsed + 1, dtype=np.int32),
         "enrolled": enrolled,
         "daily": daily
-    })
+    }, copy=False)
+
+
+def _fit_ols_hac(
+    day: np.ndarray,
+    y: np.ndarray,
+    use_hac: bool = True,
+    maxlags: Optional[int] = None
+) -> dict:
+    """Closed-form OLS of y on [1, day] with optional Newey-West SE.
+
+    Matches statsmodels OLS with cov_type="HAC" (Bartlett kernel, no
+    small-sample correction, t-distribution p-values).
+    """
+    from scipy.special import stdtr
+
+    day = np.asarray(day, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+
+    # Normal equations for the 2x2 system
+    sx = day.sum()
+    sxx = day @ day
+    sy = y.sum()
+    sxy = day @ y
+    det = n * sxx - sx * sx
+    beta_1 = (n * sxy - sx * sy) / det
+    beta_0 = (sy - beta_1 * sx) / n
+    residuals = y - beta_0 - beta_1 * day
+
+    ssr = residuals @ residuals
+    centered = y - sy / n
+    r_squared = 1 - ssr / (centered @ centered)
+
+    # (X'X)^-1 in closed form
+    bread = np.array([[sxx, -sx], [-sx, n]]) / det
+
+    if use_hac:
+        if maxlags is None:
+            maxlags = int(4 * (n / 100) ** (2 / 9))
+        # Score contributions x_t * r_t, one row per observation
+        scores = np.column_stack((residuals, day * residuals))
+        meat = scores.T @ scores
+        for j in range(1, maxlags + 1):
+            gamma = scores[j:].T @ scores[:-j]
+            meat += (1 - j / (maxlags + 1)) * (gamma + gamma.T)
+        cov = bread @ meat @ bread
+    else:
+        cov = bread * (ssr / (n - 2))
+
+    se_beta_1 = np.sqrt(cov[1, 1])
+    t_stat = beta_1 / se_beta_1
+    p_value = 2 * stdtr(n - 2, -abs(t_stat))
+
+    return {
+        "beta_0": beta_0,
+        "beta_1": beta_1,
+        "se_beta_1": se_beta_1,
+        "t_stat": t_stat,
+        "p_value": p_value,
+        "r_squared": r_squared,
+        "residuals": residuals,
+    }
+
+
+@lru_cache(maxsize=32)
+def _fit_cached(
+    day_bytes: bytes,
+    enrolled_bytes: bytes,
+    dtypes: tuple,
+    use_hac: bool,
+    maxlags: Optional[int]
+) -> dict:
+    """Fit from raw array bytes so identical histories hit the cache."""
+    result = _fit_ols_hac(
+        np.frombuffer(day_bytes, dtype=dtypes[0]),
+        np.frombuffer(enrolled_bytes, dtype=dtypes[1]),
+        use_hac=use_hac,
+        maxlags=maxlags
+    )
+    # Shared between cache hits, so keep it immutable
+    result["residuals"].flags.writeable = False
+    return result
 
 
 def fit_enrollment_model(
@@ -139,34 +203,23 @@ def fit_enrollment_model(
             - t_stat: t-statistic for slope
             - p_value: p-value for slope significance
             - r_squared: Model R-squared
-            - residuals: Model residuals
-            - model: Fitted statsmodels OLS object
+            - residuals: Model residuals (read-only array)
     """
-    y = enrollment_history["enrolled"].values
-    X = sm.add_constant(enrollment_history["day"].values)
-
-    model = sm.OLS(y, X).fit()
-
-    if use_hac:
-        # Newey-West HAC-robust standard errors
-        n = len(y)
-        if maxlags is None:
-            maxlags = int(4 * (n / 100) ** (2 / 9))
-        model = model.get_robustcov_results(
-            cov_type="HAC",
-            maxlags=maxlags
-        )
-
-    return {
-        "beta_0": model.params[0],
-        "beta_1": model.params[1],
-        "se_beta_1": model.bse[1],
-        "t_stat": model.tvalues[1],
-        "p_value": model.pvalues[1],
-        "r_squared": model.rsquared,
-        "residuals": model.resid,
-        "model": model
-    }
+    # forecast_enrollment and generate_forecast_series both fit the same
+    # history; memoizing on the array bytes makes the second fit free
+    day = np.ascontiguousarray(
+        enrollment_history["day"].to_numpy(copy=False)
+    )
+    enrolled = np.ascontiguousarray(
+        enrollment_history["enrolled"].to_numpy(copy=False)
+    )
+    return dict(_fit_cached(
+        day.tobytes(),
+        enrolled.tobytes(),
+        (day.dtype.str, enrolled.dtype.str),
+        use_hac,
+        maxlags
+    ))
 
 
 def forecast_enrollment(
@@ -206,10 +259,10 @@ def forecast_enrollment(
     beta_1 = model_results["beta_1"]
     se_beta_1 = model_results["se_beta_1"]
 
-    # Current status
-    current_day = enrollment_history["day"].max()
-    current_enrolled = enrollment_history["enrolled"].iloc[-1]
-    start_date = enrollment_history["date"].iloc[0]
+    # Current status, read from the underlying arrays
+    current_day = enrollment_history["day"].to_numpy(copy=False).max()
+    current_enrolled = enrollment_history["enrolled"].to_numpy(copy=False)[-1]
+    start_date = enrollment_history["date"].iat[0]
 
     # Days remaining to target: solve target = beta_0 + beta_1 * day
     if beta_1 > 0:
@@ -299,6 +352,7 @@ def generate_forecast_series(
             - type: 'actual' or 'forecast'
             - ci_lower: Lower confidence bound (forecast only)
             - ci_upper: Upper confidence bound (forecast only)
+            Value columns (enrolled, ci_lower, ci_upper) are float32.
     """
     model_results = fit_enrollment_model(enrollment_history, use_hac=True)
     beta_0 = model_results["beta_0"]
@@ -312,49 +366,48 @@ def generate_forecast_series(
     historical["ci_upper"] = np.nan
 
     # Forecast data
-    last_day = enrollment_history["day"].max()
-    last_enrolled = enrollment_history["enrolled"].iloc[-1]
-    start_date = enrollment_history["date"].iloc[0]
-
-    forecast_days_range = range(last_day + 1, last_day + forecast_days + 1)
-    forecast_dates = [
-        start_date + timedelta(days=d) for d in forecast_days_range
-    ]
+    last_day = enrollment_history["day"].to_numpy(copy=False).max()
+    last_enrolled = enrollment_history["enrolled"].to_numpy(copy=False)[-1]
+    start_date = enrollment_history["date"].iat[0]
+
+    forecast_dates = pd.date_range(
+        start_date + pd.Timedelta(days=int(last_day) + 1),
+        periods=forecast_days,
+        freq="D"
+    )
 
     # Point forecast - anchor to last_enrolled and project forward with slope
     # This ensures continuity between actual and forecast
-    forecast_enrolled = []
-    for d in forecast_days_range:
-        days_ahead = d - last_day
-        projected = last_enrolled + beta_1 * days_ahead
-        forecast_enrolled.append(min(target_enrollment, max(0, projected)))
+    days_ahead = np.arange(1, forecast_days + 1)
+    forecast_enrolled = np.minimum(
+        target_enrollment,
+        np.maximum(0, last_enrolled + beta_1 * days_ahead)
+    )
 
     # Confidence intervals (approximate)
     # Uncertainty grows from the last observed point, not from day 0
     z = 1.96  # 95% CI
-    ci_lower = []
-    ci_upper = []
-    for i, d in enumerate(forecast_days_range):
-        point = forecast_enrolled[i]
-        # Uncertainty grows with days ahead from last observation
-        days_ahead = d - last_day
-        uncertainty = z * se_beta_1 * days_ahead
-        # Cap CI to reasonable bounds: [last_enrolled, target]
-        lower = max(last_enrolled * 0.9, point - uncertainty)
-        upper = min(target_enrollment, point + uncertainty)
-        ci_lower.append(lower)
-        ci_upper.append(upper)
+    uncertainty = z * se_beta_1 * days_ahead
+    # Cap CI to reasonable bounds: [last_enrolled, target]
+    ci_lower = np.maximum(last_enrolled * 0.9, forecast_enrolled - uncertainty)
+    ci_upper = np.minimum(target_enrollment, forecast_enrolled + uncertainty)
 
     forecast = pd.DataFrame({
         "date": forecast_dates,
-        "day": list(forecast_days_range),
+        "day": last_day + days_ahead,
         "enrolled": forecast_enrolled,
         "type": "forecast",
         "ci_lower": ci_lower,
         "ci_upper": ci_upper
     })
 
-    return pd.concat([historical, forecast], ignore_index=True)
+    series = pd.concat([historical, forecast], ignore_index=True)
+
+    # Plotting doesn't need float64 precision; halve the payload size
+    value_cols = ["enrolled", "ci_lower", "ci_upper"]
+    series[value_cols] = series[value_cols].astype(np.float32)
+
+    return series
 
 
 if __name__ == "__main__":
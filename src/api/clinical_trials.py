@@ -1,18 +1,151 @@
 # src/api/clinical_trials.py
 """ClinicalTrials.gov API wrapper for fetching trial data."""
 
+import threading
+import time
+import pandas as pd
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Iterable, Iterator, List, Optional
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON decoding
+    orjson = None
 
 
 BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
 TIMEOUT = 30
+POOL_SIZE = 10
+CACHE_TTL = 3600
+
+# Enough to list and analyze a trial; parse_trial_summary() fills the
+# site, condition and intervention fields only when DETAIL_FIELDS are
+# fetched, since the location list dominates the payload size
+SEARCH_FIELDS = (
+    "NCTId", "BriefTitle", "Phase", "OverallStatus",
+    "EnrollmentCount", "EnrollmentType",
+    "StartDate", "PrimaryCompletionDate", "LeadSponsorName"
+)
+DETAIL_FIELDS = SEARCH_FIELDS + (
+    "LocationFacility", "Condition", "InterventionName"
+)
+
+# (url, sorted params) -> (expires_at, etag, payload)
+_response_cache = {}
+_RESPONSE_CACHE_SIZE = 128
+
+# get_trial_details_many() workers share the cache; writes and evictions
+# go through this lock
+_cache_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a pooled session that retries transient server errors."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip"
+    })
+    return session
+
+
+# Reused across calls so requests share keep-alive TLS connections
+_SESSION = _build_session()
+
+
+def _decode_json(response: requests.Response) -> dict:
+    """Decode a response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _get_json(
+    url: str,
+    params: Optional[dict] = None,
+    refresh: bool = False
+) -> dict:
+    """GET a JSON payload, serving repeats from the response cache.
+
+    Fresh entries are returned without touching the network. Stale
+    entries, or any entry when `refresh` is set, are revalidated with
+    If-None-Match so an unchanged payload comes back as a bodyless 304.
+    Cached payloads are shared between callers and must not be mutated.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = _response_cache.get(key)
+    if cached and not refresh and cached[0] > time.monotonic():
+        return cached[2]
+
+    headers = {}
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+
+    response = _SESSION.get(
+        url, params=params, headers=headers, timeout=TIMEOUT
+    )
+    if cached and response.status_code == 304:
+        payload = cached[2]
+    else:
+        response.raise_for_status()
+        payload = _decode_json(response)
+
+    with _cache_lock:
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            _response_cache.pop(key, None)
+            return payload
+
+        if key not in _response_cache and (
+            len(_response_cache) >= _RESPONSE_CACHE_SIZE
+        ):
+            _response_cache.pop(next(iter(_response_cache)))
+        _response_cache[key] = (
+            time.monotonic() + CACHE_TTL,
+            response.headers.get("ETag") or (cached[1] if cached else None),
+            payload
+        )
+    return payload
+
+
+def _search_params(
+    condition: str,
+    status: Optional[str],
+    page_size: int,
+    fields: Optional[Iterable[str]]
+) -> dict:
+    """Build query parameters for the studies search endpoint."""
+    params = {
+        "query.cond": condition,
+        "pageSize": page_size,
+        "fields": ",".join(SEARCH_FIELDS if fields is None else fields)
+    }
+
+    if status:
+        params["filter.overallStatus"] = status
+
+    return params
 
 
 def search_trials(
     condition: str,
     status: Optional[str] = "RECRUITING",
-    page_size: int = 10
+    page_size: int = 10,
+    refresh: bool = False,
+    fields: Optional[Iterable[str]] = None
 ) -> dict:
     """Search clinical trials by condition.
 
@@ -24,6 +157,10 @@ def search_trials(
             NOT_YET_RECRUITING, TERMINATED, WITHDRAWN,
             SUSPENDED. Use None for all statuses.
         page_size: Number of results to return (max 1000).
+        refresh: Revalidate with the API even if a cached response
+            is still fresh.
+        fields: API field names to return. Defaults to SEARCH_FIELDS;
+            pass DETAIL_FIELDS for everything parse_trial_summary() uses.
 
     Returns:
         dict: JSON response containing trial data with keys:
@@ -34,32 +171,62 @@ def search_trials(
     Raises:
         requests.exceptions.RequestException: If API call fails.
     """
-    params = {
-        "query.cond": condition,
-        "pageSize": page_size,
-        "fields": (
-            "NCTId,BriefTitle,Phase,OverallStatus,"
-            "EnrollmentCount,EnrollmentType,"
-            "StartDate,PrimaryCompletionDate,"
-            "LocationFacility,LeadSponsorName,"
-            "Condition,InterventionName"
-        )
-    }
+    params = _search_params(condition, status, page_size, fields)
+    return _get_json(BASE_URL, params=params, refresh=refresh)
 
-    if status:
-        params["filter.overallStatus"] = status
 
-    response = requests.get(BASE_URL, params=params, timeout=TIMEOUT)
-    response.raise_for_status()
+def iter_trials(
+    condition: str,
+    status: Optional[str] = "RECRUITING",
+    page_size: int = 1000,
+    fields: Optional[Iterable[str]] = None,
+    refresh: bool = False
+) -> Iterator[dict]:
+    """Iterate over every trial matching a condition, page by page.
 
-    return response.json()
+    Follows nextPageToken across result pages. Pages are only fetched
+    as the iterator is consumed, so callers that stop early skip the
+    remaining requests.
+
+    Args:
+        condition: Medical condition to search for.
+        status: Trial status filter, as in search_trials().
+        page_size: Number of results per request (max 1000).
+        fields: API field names to return, as in search_trials().
+        refresh: Revalidate each page with the API even if a cached
+            response is still fresh.
+
+    Yields:
+        dict: Raw trial objects, as in search_trials()["studies"].
+
+    Raises:
+        requests.exceptions.RequestException: If an API call fails.
+    """
+    params = _search_params(condition, status, page_size, fields)
 
+    while True:
+        page = _get_json(BASE_URL, params=params, refresh=refresh)
+        yield from page.get("studies", [])
 
-def get_trial_details(nct_id: str) -> dict:
+        token = page.get("nextPageToken")
+        if not token:
+            return
+        params = {**params, "pageToken": token}
+
+
+def get_trial_details(
+    nct_id: str,
+    refresh: bool = False,
+    fields: Optional[Iterable[str]] = None
+) -> dict:
     """Get detailed information for a specific trial.
 
     Args:
         nct_id: The NCT identifier (e.g., "NCT12345678").
+        refresh: Revalidate with the API even if a cached response
+            is still fresh.
+        fields: API field names to return, e.g. DETAIL_FIELDS. Defaults
+            to the complete record.
 
     Returns:
         dict: Complete trial data including:
@@ -74,34 +241,61 @@ def get_trial_details(nct_id: str) -> dict:
     if not nct_id.startswith("NCT"):
         raise ValueError(f"Invalid NCT ID format: {nct_id}")
 
-    url = f"{BASE_URL}/{nct_id}"
-    response = requests.get(url, timeout=TIMEOUT)
-    response.raise_for_status()
+    params = None
+    if fields is not None:
+        params = {"fields": ",".join(fields)}
 
-    return response.json()
+    return _get_json(f"{BASE_URL}/{nct_id}", params=params, refresh=refresh)
 
 
-def parse_trial_summary(trial: dict) -> dict:
-    """Extract key fields from a trial response.
+def get_trial_details_many(
+    nct_ids: List[str],
+    fields: Optional[Iterable[str]] = None
+) -> List[dict]:
+    """Get detailed information for several trials concurrently.
+
+    Requests are issued in parallel over the shared connection pool, so
+    N trials take roughly one round trip instead of N.
 
     Args:
-        trial: Raw trial data from API response.
+        nct_ids: NCT identifiers to fetch.
+        fields: API field names to return, as in get_trial_details().
 
     Returns:
-        dict: Simplified trial summary with keys:
-            - nct_id: Trial identifier
-            - title: Brief title
-            - phase: Trial phase
-            - status: Current status
-            - enrollment_target: Target enrollment
-            - enrollment_type: ACTUAL or ESTIMATED
-            - start_date: Trial start date
-            - completion_date: Primary completion date
-            - sponsor: Lead sponsor name
-            - conditions: List of conditions
-            - interventions: List of interventions
-            - sites_count: Number of study sites
+        List[dict]: Trial data in the same order as `nct_ids`, each as
+            returned by get_trial_details().
+
+    Raises:
+        requests.exceptions.RequestException: If any API call fails.
+        ValueError: If any NCT ID format is invalid.
     """
+    # Validate everything before any request goes out
+    for nct_id in nct_ids:
+        if not nct_id.startswith("NCT"):
+            raise ValueError(f"Invalid NCT ID format: {nct_id}")
+
+    if not nct_ids:
+        return []
+
+    with ThreadPoolExecutor(
+        max_workers=min(POOL_SIZE, len(nct_ids))
+    ) as executor:
+        return list(executor.map(
+            lambda nct_id: get_trial_details(nct_id, fields=fields),
+            nct_ids
+        ))
+
+
+SUMMARY_COLUMNS = (
+    "nct_id", "title", "phase", "status",
+    "enrollment_target", "enrollment_type",
+    "start_date", "completion_date",
+    "sponsor", "conditions", "interventions", "sites_count"
+)
+
+
+def _summary_row(trial: dict) -> tuple:
+    """Extract summary values from a trial in SUMMARY_COLUMNS order."""
     protocol = trial.get("protocolSection", {})
     id_module = protocol.get("identificationModule", {})
     status_module = protocol.get("statusModule", {})
@@ -122,24 +316,64 @@ def parse_trial_summary(trial: dict) -> dict:
     # Get enrollment info
     enrollment_info = design_module.get("enrollmentInfo", {})
 
-    return {
-        "nct_id": id_module.get("nctId", ""),
-        "title": id_module.get("briefTitle", ""),
-        "phase": ",".join(design_module.get("phases", ["N/A"])),
-        "status": status_module.get("overallStatus", ""),
-        "enrollment_target": enrollment_info.get("count", 0),
-        "enrollment_type": enrollment_info.get("type", ""),
-        "start_date": status_module.get("startDateStruct", {}).get(
-            "date", ""
-        ),
-        "completion_date": status_module.get(
-            "primaryCompletionDateStruct", {}
-        ).get("date", ""),
-        "sponsor": sponsor_module.get("leadSponsor", {}).get("name", ""),
-        "conditions": conditions_module.get("conditions", []),
-        "interventions": intervention_names,
-        "sites_count": sites_count
-    }
+    return (
+        id_module.get("nctId", ""),
+        id_module.get("briefTitle", ""),
+        ",".join(design_module.get("phases", ["N/A"])),
+        status_module.get("overallStatus", ""),
+        enrollment_info.get("count", 0),
+        enrollment_info.get("type", ""),
+        status_module.get("startDateStruct", {}).get("date", ""),
+        status_module.get("primaryCompletionDateStruct", {}).get("date", ""),
+        sponsor_module.get("leadSponsor", {}).get("name", ""),
+        conditions_module.get("conditions", []),
+        intervention_names,
+        sites_count
+    )
+
+
+def parse_trial_summary(trial: dict) -> dict:
+    """Extract key fields from a trial response.
+
+    Args:
+        trial: Raw trial data from API response.
+
+    Returns:
+        dict: Simplified trial summary with keys:
+            - nct_id: Trial identifier
+            - title: Brief title
+            - phase: Trial phase
+            - status: Current status
+            - enrollment_target: Target enrollment
+            - enrollment_type: ACTUAL or ESTIMATED
+            - start_date: Trial start date
+            - completion_date: Primary completion date
+            - sponsor: Lead sponsor name
+            - conditions: List of conditions
+            - interventions: List of interventions
+            - sites_count: Number of study sites
+    """
+    return dict(zip(SUMMARY_COLUMNS, _summary_row(trial)))
+
+
+def parse_trials_batch(studies: List[dict]) -> pd.DataFrame:
+    """Parse a page of trial responses into a DataFrame.
+
+    Builds rows as tuples rather than one summary dict per trial, so
+    large pages skip the per-row dict and key inference.
+
+    Args:
+        studies: Raw trial objects, e.g. the "studies" list from
+            search_trials().
+
+    Returns:
+        pd.DataFrame: One row per trial with SUMMARY_COLUMNS as columns,
+            matching the keys of parse_trial_summary().
+    """
+    return pd.DataFrame.from_records(
+        [_summary_row(trial) for trial in studies],
+        columns=list(SUMMARY_COLUMNS)
+    )
 
 
 if __name__ == "__main__":
@@ -147,8 +381,13 @@ if __name__ == "__main__":
     print("Testing ClinicalTrials.gov API...")
     print("-" * 50)
 
-    # Search for diabetes trials
-    results = search_trials("diabetes", status="RECRUITING", page_size=3)
+    # Search for diabetes trials; site counts need the detail fields
+    results = search_trials(
+        "diabetes",
+        status="RECRUITING",
+        page_size=3,
+        fields=DETAIL_FIELDS
+    )
     studies = results.get("studies", [])
 
     print(f"Found {results.get('totalCount', 0)} total recruiting trials")